@@ -100,6 +100,16 @@ else:
         }
     }
 
+# Cache
+# Local-memory cache is per process; cached per-user data is keyed by a version read from
+# the database, so every worker sees a user's changes without sharing the cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'aicaddy',
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
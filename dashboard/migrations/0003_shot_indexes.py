@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-14 05:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_launchmonitorimport'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='shot',
+            index=models.Index(fields=['club', 'lie'], name='dashboard_s_club_id_0bc7d9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shot',
+            index=models.Index(fields=['club', 'distance'], name='dashboard_s_club_id_f23442_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-14 05:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_shot_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='golfround',
+            index=models.Index(fields=['user', '-date'], name='dashboard_g_user_id_7dfe4e_idx'),
+        ),
+    ]
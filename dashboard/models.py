@@ -1,49 +1,96 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models import Avg, StdDev
+from django.db.models import Avg, StdDev, Count, Q
+from django.db.models.functions import Round
+from django.utils.functional import cached_property
+
+class ClubQuerySet(models.QuerySet):
+    def with_distance_stats(self):
+        """
+        Annotates each club with its distance aggregates in a single query. The overall average
+        is rounded to 1 decimal by the database; the lie averages are left unrounded and rounded
+        to whole yards in Python (round() rounds halves to even, SQL ROUND() away from zero).
+        """
+        return self.annotate(
+            avg_distance=Round(Avg('shot__distance'), 1),
+            avg_fairway=Avg('shot__distance', filter=Q(shot__lie__in=['Fairway', 'Tee Box'])),
+            avg_rough=Avg('shot__distance', filter=Q(shot__lie='Rough')),
+            shot_count=Count('shot'),
+        )
 
 class Club(models.Model):
     """Represents a single golf club in a user's bag."""
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=100, help_text="e.g., Driver, 7 Iron, Pitching Wedge")
 
+    objects = ClubQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
-    def get_average_distance(self):
+    @cached_property
+    def average_distance(self):
         """Calculates the average distance for this club across all shots."""
-        avg = self.shot_set.aggregate(average=Avg('distance'))['average']
-        return round(avg, 1) if avg else 0
+        return self.shot_set.aggregate(average=Round(Avg('distance'), 1))['average'] or 0
 
-    def get_distance_std_dev(self):
+    @cached_property
+    def distance_std_dev(self):
         """Calculates the standard deviation of distance for this club."""
-        stddev = self.shot_set.aggregate(stddev=StdDev('distance'))['stddev']
-        return round(stddev, 1) if stddev else 0
+        return self.shot_set.aggregate(stddev=Round(StdDev('distance'), 1))['stddev'] or 0
 
-    def get_average_distance_fairway(self):
+    @cached_property
+    def average_distance_fairway(self):
         """Calculates average distance for Fairway and Tee Box shots (excludes Sand and Rough)."""
         avg = self.shot_set.filter(lie__in=['Fairway', 'Tee Box']).aggregate(average=Avg('distance'))['average']
         return int(round(avg)) if avg else None
 
-    def get_average_distance_rough(self):
+    @cached_property
+    def average_distance_rough(self):
         """Calculates average distance for Rough shots only (excludes Sand, Fairway, Tee Box)."""
         avg = self.shot_set.filter(lie='Rough').aggregate(average=Avg('distance'))['average']
         return int(round(avg)) if avg else None
 
-    def get_fairway_shot_count(self):
+    @cached_property
+    def fairway_shot_count(self):
         """Returns count of shots from Fairway and Tee Box."""
         return self.shot_set.filter(lie__in=['Fairway', 'Tee Box']).count()
 
-    def get_rough_shot_count(self):
+    @cached_property
+    def rough_shot_count(self):
         """Returns count of shots from Rough."""
         return self.shot_set.filter(lie='Rough').count()
 
+    def get_average_distance_for_lie(self, lie):
+        """
+        Returns the average distance for the given lie.
+        Uses the with_distance_stats() annotations when present, otherwise queries.
+        """
+        annotated = hasattr(self, 'avg_distance')
+        if lie in ['Fairway', 'Tee Box']:
+            if not annotated:
+                return self.average_distance_fairway
+            return int(round(self.avg_fairway)) if self.avg_fairway else None
+        elif lie == 'Rough':
+            if not annotated:
+                return self.average_distance_rough
+            return int(round(self.avg_rough)) if self.avg_rough else None
+        # Fallback: use general average if lie is something else
+        if not annotated:
+            return self.average_distance
+        return self.avg_distance or 0
+
 class GolfRound(models.Model):
     """Represents a single round of golf played by a user."""
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     date = models.DateField(auto_now_add=True)
     course_name = models.CharField(max_length=200)
 
+    class Meta:
+        # Serves the dashboard's newest-first list of a user's rounds
+        indexes = [
+            models.Index(fields=['user', '-date']),
+        ]
+
     def __str__(self):
         return f"{self.course_name} on {self.date}"
 
@@ -59,6 +106,13 @@ class Shot(models.Model):
     shot_shape = models.CharField(max_length=10, choices=SHOT_SHAPE_CHOICES)
     lie = models.CharField(max_length=10, choices=LIE_CHOICES)
 
+    class Meta:
+        # Cover the per-club, lie-filtered distance aggregates used by Club
+        indexes = [
+            models.Index(fields=['club', 'lie']),
+            models.Index(fields=['club', 'distance']),
+        ]
+
     def __str__(self):
         return f"{self.club.name} - {self.distance} yards"
 
@@ -3,11 +3,227 @@ Launch Monitor Data Parsers
 Handles parsing CSV and JSON exports from various launch monitor devices.
 """
 import csv
+import functools
 import json
+import math
 import re
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, time
+from typing import Dict, Iterator, List, Optional, Tuple
 from io import StringIO
+import numpy as np
+
+
+# Whitespace and stray quote characters trimmed from cells in one pass
+_STRIP_CHARS = ' \t\r\n"'
+
+
+def _tofloat(value) -> Optional[float]:
+    """Convert a CSV cell or JSON value to float, or None if empty or not numeric."""
+    if isinstance(value, str):
+        value = value.strip(_STRIP_CHARS)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _toint(value) -> Optional[int]:
+    """Like _tofloat, truncated to int (None for inf/nan)."""
+    number = _tofloat(value)
+    if number is None or not math.isfinite(number):
+        return None
+    return int(number)
+
+
+def _toabsfloat(value) -> Optional[float]:
+    """Like _tofloat, as a magnitude (spin is exported signed by some devices)."""
+    number = _tofloat(value)
+    return abs(number) if number is not None else None
+
+
+def _read_csv(content: str) -> Tuple[Dict[str, int], Iterator[List[str]]]:
+    """
+    Open CSV content with csv.reader, returning a {column name: index} map for
+    the header row and an iterator over the data rows. Blank lines are skipped
+    as csv.DictReader skips them, so row numbers in messages still line up.
+    """
+    reader = csv.reader(StringIO(content))
+    header = next(reader, [])
+    columns = {name: index for index, name in enumerate(header)}
+    return columns, (row for row in reader if row)
+
+
+def _cell(row: List[str], index: Optional[int]) -> str:
+    """Value of a row at a header index, or '' if the column is absent or the row is short."""
+    if index is None or index >= len(row):
+        return ''
+    return row[index]
+
+
+def _column_indexes(columns: Dict[str, int], names) -> Tuple[int, ...]:
+    """Header indexes of whichever of names are present, in preference order."""
+    return tuple(columns[name] for name in names if name in columns)
+
+
+def _resolve_fields(columns: Dict[str, int], schema) -> List[Tuple[Tuple[int, ...], str, object]]:
+    """
+    Resolve a field schema against a CSV header once per file. Each entry's
+    source column(s) become header indexes; fields with no column are dropped.
+    """
+    resolved = []
+    for fields, key, convert in schema:
+        indexes = _column_indexes(columns, (fields,) if isinstance(fields, str) else fields)
+        if indexes:
+            resolved.append((indexes, key, convert))
+    return resolved
+
+
+def _present_aliases(aliases: Tuple[str, ...], present_keys) -> Tuple[str, ...]:
+    """
+    The aliases that occur in present_keys, in order. The first alias is kept
+    even if absent so a malformed (non-dict) shot still fails on lookup.
+    """
+    return tuple(key for key in aliases if key in present_keys) or aliases[:1]
+
+
+def _first_value(item: Dict, keys: Tuple[str, ...]):
+    """item.get(k1) or item.get(k2) or ... over keys, None if all are falsy."""
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return value
+    return None
+
+
+# Optional launch monitor columns per device: (source column, shot key, converter)
+_GARMIN_CSV_FIELDS = (
+    ('CarryDistance', 'carryDistance', _toint),
+    ('LaunchAngle', 'launchAngle', _tofloat),
+    ('BallSpeed', 'ballSpeed', _tofloat),
+    ('SideSpun', 'spinRate', _toabsfloat),
+)
+
+# Garmin JSON keys are also accepted in lowercase
+_GARMIN_JSON_FIELDS = _GARMIN_CSV_FIELDS
+
+_SKYTRAK_FIELDS = (
+    ('CarryDistance', 'carryDistance', _toint),
+    ('LaunchAngle', 'launchAngle', _tofloat),
+    ('BallSpeed', 'ballSpeed', _tofloat),
+    ('TotalSpin', 'spinRate', _toabsfloat),
+    ('SmashFactor', 'smashFactor', _tofloat),
+)
+
+_MEVO_FIELDS = (
+    ('Carry', 'carryDistance', _toint),
+    ('Launch Angle', 'launchAngle', _tofloat),
+    ('Ball Speed', 'ballSpeed', _tofloat),
+    ('Spin Rate', 'spinRate', _toabsfloat),
+    ('Smash Factor', 'smashFactor', _tofloat),
+)
+
+# Generic exports vary in naming, so each shot key lists its candidate columns
+# in order of preference; the first one that converts wins
+_GENERIC_FIELDS = (
+    (('Carry Distance (yd)', 'Carry Distance', 'CarryDistance'), 'carryDistance', _toint),
+    (('Launch Angle (deg)', 'Launch Angle', 'LaunchAngle'), 'launchAngle', _tofloat),
+    (('Ball Speed (mph)', 'Ball Speed', 'BallSpeed'), 'ballSpeed', _tofloat),
+    (('Club Head Speed (mph)', 'Club Head Speed', 'ClubHeadSpeed'), 'clubHeadSpeed', _tofloat),
+    (('Total Spin (rpm)', 'Total Spin', 'TotalSpin', 'Spin Rate (rpm)', 'Spin Rate'), 'spinRate', _toabsfloat),
+    (('Smash Factor', 'SmashFactor'), 'smashFactor', _tofloat),
+    (('Launch Direction (deg)', 'Launch Direction', 'LaunchDirection'), 'launchDirection', _tofloat),
+    (('Peak Height (yd)', 'Peak Height', 'PeakHeight'), 'peakHeight', _tofloat),
+    (('Accuracy (yd)', 'Accuracy'), 'accuracy', _tofloat),
+)
+
+# Header columns used to detect CSV exports, compared after upper-casing and
+# dropping a trailing unit such as ' (mph)'. Generic and Garmin exports need
+# every column listed; SkyTrak and Mevo are recognised by any one of them.
+_UNIT_SUFFIX_RE = re.compile(r'\s*\([^)]*\)$')
+_GENERIC_HEADER_COLUMNS = frozenset({'CLUB HEAD SPEED', 'TOTAL SPIN', 'TOTAL DISTANCE'})
+_SKYTRAK_HEADER_COLUMNS = frozenset({'CLUBHEADSPEED', 'SMASHFACTOR'})
+_MEVO_HEADER_COLUMNS = frozenset({'SPIN RATE', 'PEAK HEIGHT'})
+_GARMIN_HEADER_COLUMNS = frozenset({'DATE', 'COURSE'})
+
+# Hole numbers arrive as '7', 'Hole 7', 'H7', ... - the first run of digits is the number
+_HOLE_NUM_RE = re.compile(r'\d+')
+
+
+# Date/time layouts accepted by the parsers. These mirror the strptime formats
+# '%Y-%m-%d', '%m/%d/%Y' and '%H:%M:%S' but are matched directly, so a row
+# doesn't pay for strptime re-reading the format and raising on every miss.
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})', re.ASCII)
+_MDY_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})', re.ASCII)
+_TIME_RE = re.compile(r'(\d{1,2}):(\d{1,2}):(\d{1,2})', re.ASCII)
+
+
+# Exports repeat the same handful of dates on every row, so the date parsers
+# are memoized; times are unique per shot and are parsed directly.
+@functools.lru_cache(maxsize=256)
+def _parse_iso_date(value: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD date, returning None if it isn't one."""
+    # Zero-padded dates (what every exporter writes) are sliced directly;
+    # the regex only handles unpadded months/days
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        digits = value[:4] + value[5:7] + value[8:10]
+        if digits.isascii() and digits.isdigit():
+            year, month, day = digits[:4], digits[4:6], digits[6:]
+            try:
+                return date(int(year), int(month), int(day))
+            except ValueError:
+                return None
+    match = _ISO_DATE_RE.fullmatch(value)
+    if match:
+        year, month, day = match.groups()
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            pass
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_mdy_date(value: str) -> Optional[date]:
+    """Parse a MM/DD/YYYY date, returning None if it isn't one."""
+    match = _MDY_DATE_RE.fullmatch(value)
+    if match:
+        month, day, year = match.groups()
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            pass
+    return None
+
+
+def _fast_parse_date(value: str) -> Optional[date]:
+    """Parse an ISO or US formatted date, trying ISO first."""
+    return _parse_iso_date(value) or _parse_mdy_date(value)
+
+
+def _parse_time(value: str) -> Optional[time]:
+    """Parse a HH:MM:SS time, returning None if it isn't one."""
+    match = _TIME_RE.fullmatch(value)
+    if match:
+        hour, minute, second = match.groups()
+        try:
+            return time(int(hour), int(minute), int(second))
+        except ValueError:
+            pass
+    return None
+
+
+def _fast_parse_datetime(value: str) -> Optional[datetime]:
+    """Parse '<ISO or US date> HH:MM:SS', returning None if it isn't one."""
+    parts = value.split()
+    if len(parts) != 2:
+        return None
+    date_obj = _fast_parse_date(parts[0])
+    time_obj = _parse_time(parts[1])
+    if date_obj is None or time_obj is None:
+        return None
+    return datetime.combine(date_obj, time_obj)
 
 
 class LaunchMonitorParser:
@@ -16,77 +232,84 @@ class LaunchMonitorParser:
     def __init__(self):
         self.errors = []
         self.warnings = []
+        self._json_source = None
+        self._json_data = None
     
-    def _infer_shot_shape(self, launch_direction: Optional[float], 
-                          carry_distance: Optional[float], 
-                          total_distance: Optional[float]) -> Optional[str]:
+    def _infer_shot_shapes(self, shots: List[Dict]) -> None:
         """
-        Infers shot shape from launch monitor data.
+        Infers shot shape for a whole session in one numpy pass and sets
+        'shotShape' on each shot that has a launchDirection.
         
         Logic:
-        - Launch Direction (degrees): negative = left, positive = right, 0 = straight
+        - Launch Direction (degrees): negative = left, positive = right, within ±5° = straight
         - Compare Carry Distance vs Total Distance to determine severity of curve
         - If total < carry significantly, indicates severe curve (Hook/Slice) - ball curved back
         - Launch direction magnitude determines severity: > 15° = severe, 5-15° = controlled
         
-        Returns: 'Straight', 'Fade', 'Draw', 'Slice', or 'Hook'
+        Shapes: 'Straight', 'Fade', 'Draw', 'Slice', or 'Hook'
         """
-        # If no launch direction, can't infer
-        if launch_direction is None:
-            return None
-        
-        try:
-            launch_dir = float(launch_direction)
-        except (ValueError, TypeError):
-            return None
-        
-        # Straight shot: launch direction within ±5 degrees
-        if abs(launch_dir) <= 5.0:
-            return 'Straight'
-        
-        # Calculate distance metrics (if both distances available)
-        distance_loss_ratio = None
-        if carry_distance is not None and total_distance is not None:
-            try:
-                carry = float(carry_distance)
-                total = float(total_distance)
-                if carry > 0:
-                    # If total is significantly less than carry, indicates severe curve (ball curved back)
-                    # This happens when a hook/slice causes the ball to lose distance
-                    distance_loss_ratio = (carry - total) / carry
-            except (ValueError, TypeError):
-                pass
-        
-        # Determine if it's a severe curve (Hook/Slice) or controlled curve (Draw/Fade)
-        is_severe = False
-        
-        # Check 1: Large launch angle (> 15 degrees) indicates severe curve
-        if abs(launch_dir) > 15.0:
-            is_severe = True
-        # Check 2: If total distance is significantly less than carry (> 5% loss), severe curve
-        elif distance_loss_ratio is not None and distance_loss_ratio > 0.05:
-            is_severe = True
-        # Check 3: Moderate launch angle (10-15 degrees) with some distance loss
-        elif abs(launch_dir) > 10.0 and distance_loss_ratio is not None and distance_loss_ratio > 0.02:
-            is_severe = True
-        
-        # Left side (negative launch direction)
-        if launch_dir < 0:
-            if is_severe:
-                return 'Hook'  # Severe left curve
-            else:
-                return 'Draw'  # Controlled left curve
+        if not shots:
+            return
+        
+        has_direction = np.array(['launchDirection' in shot for shot in shots])
+        if not has_direction.any():
+            return
+        
+        launch_dir = np.array([shot.get('launchDirection', np.nan) for shot in shots], dtype=float)
+        carry = np.array([shot.get('carryDistance', np.nan) for shot in shots], dtype=float)
+        total = np.array([shot['distance'] for shot in shots], dtype=float)
+        
+        abs_dir = np.abs(launch_dir)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # NaN (no comparison holds) where carry is missing or not positive
+            distance_loss_ratio = np.where(carry > 0, (carry - total) / carry, np.nan)
+        
+        is_severe = (
+            (abs_dir > 15.0)
+            | (distance_loss_ratio > 0.05)
+            | ((abs_dir > 10.0) & (distance_loss_ratio > 0.02))
+        )
+        shapes = np.where(
+            launch_dir < 0,
+            np.where(is_severe, 'Hook', 'Draw'),
+            np.where(is_severe, 'Slice', 'Fade'),
+        )
+        shapes = np.where(abs_dir <= 5.0, 'Straight', shapes)
+        
+        for shot, has_dir, shape in zip(shots, has_direction.tolist(), shapes.tolist()):
+            if has_dir:
+                shot['shotShape'] = shape
+    
+    def _finalize_rounds(self, rounds_dict: Dict, source_device: str, imported_at: datetime) -> Dict:
+        """Convert the per-parser rounds_dict into the normalized import format."""
+        rounds_list = []
+        for round_data in rounds_dict.values():
+            holes = round_data['holes']
+            rounds_list.append({
+                'date': round_data['date'],
+                'courseName': round_data['courseName'],
+                'holes': [
+                    {
+                        'holeNumber': hole_num,
+                        'shots': holes[hole_num]
+                    }
+                    for hole_num in sorted(holes)
+                ]
+            })
         
-        # Right side (positive launch direction)
-        else:  # launch_dir > 0
-            if is_severe:
-                return 'Slice'  # Severe right curve
-            else:
-                return 'Fade'  # Controlled right curve
+        return {
+            'rounds': rounds_list,
+            'sourceDevice': source_device,
+            'importedAt': imported_at.isoformat(),
+            'errors': self.errors,
+            'warnings': self.warnings
+        }
     
     def parse(self, file_content: str, file_extension: str, device_type: Optional[str] = None) -> Dict:
         self.errors = []
         self.warnings = []
+        self._json_source = None
+        self._json_data = None
         
         # Auto-detect device type if not provided
         if not device_type:
@@ -99,35 +322,70 @@ class LaunchMonitorParser:
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
     
+    def _load_json(self, content: str):
+        """
+        Decode JSON content, reusing the result for the same content string so
+        detection and parsing don't decode the same export twice.
+        """
+        if self._json_source is not content:
+            self._json_data = json.loads(content)
+            self._json_source = content
+        return self._json_data
+    
+    def _has_arccos_keys(self, data: Dict) -> bool:
+        """
+        Check for Arccos shot keys on the root object and on the first shot of
+        the layouts _parse_arccos_json reads ('shots' or 'rounds' -> 'shots'),
+        without walking the whole document.
+        """
+        candidates = [data]
+        shots = data.get('shots')
+        if isinstance(shots, list) and shots:
+            candidates.append(shots[0])
+        rounds = data.get('rounds')
+        if isinstance(rounds, list) and rounds and isinstance(rounds[0], dict):
+            candidates.append(rounds[0])
+            round_shots = rounds[0].get('shots')
+            if isinstance(round_shots, list) and round_shots:
+                candidates.append(round_shots[0])
+        return any(
+            isinstance(candidate, dict) and ('timestamp' in candidate or 'clubId' in candidate)
+            for candidate in candidates
+        )
+    
     def _detect_device_type(self, content: str, extension: str) -> str:
         """Auto-detect device type from file content."""
         if extension.lower() == '.json':
             try:
-                data = json.loads(content)
+                data = self._load_json(content)
                 # Check for Arccos structure
-                if isinstance(data, dict) and ('timestamp' in str(data) or 'clubId' in str(data)):
+                if isinstance(data, dict) and self._has_arccos_keys(data):
                     return 'Arccos Caddie'
                 # Check for Garmin JSON structure
-                if isinstance(data, list) and len(data) > 0:
-                    if 'Date' in str(data[0]) or 'Course' in str(data[0]):
+                if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
+                    if 'Date' in data[0] or 'Course' in data[0]:
                         return 'Garmin R10'
-            except:
+            except ValueError:
+                # Not valid JSON; the parser reports it
                 pass
         
         if extension.lower() == '.csv':
-            # Read first few lines to detect
-            lines = content.split('\n')[:5]
-            header = lines[0] if lines else ''
-            header_upper = header.upper()
+            # Only the header line is needed to detect
+            newline = content.find('\n')
+            header = content[:newline] if newline >= 0 else content
+            columns = frozenset(
+                _UNIT_SUFFIX_RE.sub('', column.strip()).upper()
+                for column in next(csv.reader([header.lstrip('\ufeff')]), [])
+            )
             
             # Check for generic launch monitor format (Date, Time, Club Head Speed, Total Spin, etc.)
-            if 'CLUB HEAD SPEED' in header_upper and 'TOTAL SPIN' in header_upper and 'TOTAL DISTANCE' in header_upper:
+            if _GENERIC_HEADER_COLUMNS <= columns:
                 return 'Generic Launch Monitor'
-            elif 'CLUBHEADSPEED' in header_upper or 'SMASHFACTOR' in header_upper:
+            elif not _SKYTRAK_HEADER_COLUMNS.isdisjoint(columns):
                 return 'SkyTrak+'
-            elif 'SPIN RATE' in header_upper or 'PEAK HEIGHT' in header_upper:
+            elif not _MEVO_HEADER_COLUMNS.isdisjoint(columns):
                 return 'Flightscope Mevo+'
-            elif 'DATE' in header_upper and 'COURSE' in header_upper:
+            elif _GARMIN_HEADER_COLUMNS <= columns:
                 return 'Garmin R10'
         
         return 'Garmin R10'  # Default fallback
@@ -156,36 +414,41 @@ class LaunchMonitorParser:
     
     def _parse_garmin_r10_csv(self, content: str) -> Dict:
         """Parse Garmin R10 CSV export."""
-        reader = csv.DictReader(StringIO(content))
+        now = datetime.now()  # one timestamp per import, used for fallbacks and importedAt
+        columns, rows = _read_csv(content)
+        date_index = columns.get('Date')
+        course_index = columns.get('Course')
+        hole_index = columns.get('Hole')
+        club_index = columns.get('Club')
+        # Prefer TotalDistance, fallback to Distance
+        distance_indexes = _column_indexes(columns, ['TotalDistance', 'Distance', 'CarryDistance'])
+        optional_fields = _resolve_fields(columns, _GARMIN_CSV_FIELDS)
         rounds_dict = {}
         
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (1 is header)
+        for row_num, row in enumerate(rows, start=2):  # Start at 2 (1 is header)
             try:
                 # Extract round info
-                date_str = row.get('Date', '').strip()
-                course = row.get('Course', '').strip() or 'Unknown Course'
-                hole = row.get('Hole', '').strip()
-                club = row.get('Club', '').strip()
+                date_str = _cell(row, date_index).strip()
+                course = _cell(row, course_index).strip() or 'Unknown Course'
+                hole = _cell(row, hole_index).strip()
+                club = _cell(row, club_index).strip()
                 
                 if not date_str or not club:
                     self.warnings.append(f"Row {row_num}: Missing date or club, skipping")
                     continue
                 
                 # Parse date
-                try:
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-                except:
-                    try:
-                        date_obj = datetime.strptime(date_str, '%m/%d/%Y').date()
-                    except:
-                        self.errors.append(f"Row {row_num}: Invalid date format: {date_str}")
-                        continue
+                date_obj = _fast_parse_date(date_str)
+                if date_obj is None:
+                    self.errors.append(f"Row {row_num}: Invalid date format: {date_str}")
+                    continue
                 
                 # Create round key
-                round_key = f"{date_obj.isoformat()}_{course}"
+                round_key = (date_obj, course)
                 
-                if round_key not in rounds_dict:
-                    rounds_dict[round_key] = {
+                round_entry = rounds_dict.get(round_key)
+                if round_entry is None:
+                    round_entry = rounds_dict[round_key] = {
                         'date': date_obj.isoformat(),
                         'courseName': course,
                         'holes': {}
@@ -194,23 +457,18 @@ class LaunchMonitorParser:
                 # Parse hole number
                 hole_num = 1
                 if hole:
-                    try:
-                        hole_num = int(re.sub(r'\D', '', hole)) or 1
-                    except:
-                        hole_num = 1
+                    match = _HOLE_NUM_RE.search(hole)
+                    if match:
+                        hole_num = int(match.group()) or 1
                 
-                if hole_num not in rounds_dict[round_key]['holes']:
-                    rounds_dict[round_key]['holes'][hole_num] = []
+                shots_list = round_entry['holes'].setdefault(hole_num, [])
                 
-                # Parse distance (prefer TotalDistance, fallback to Distance)
+                # Parse distance
                 distance = None
-                for dist_field in ['TotalDistance', 'Distance', 'CarryDistance']:
-                    if dist_field in row and row[dist_field]:
-                        try:
-                            distance = int(float(row[dist_field]))
-                            break
-                        except:
-                            continue
+                for index in distance_indexes:
+                    distance = _toint(_cell(row, index))
+                    if distance is not None:
+                        break
                 
                 if not distance:
                     self.warnings.append(f"Row {row_num}: No valid distance found")
@@ -220,68 +478,30 @@ class LaunchMonitorParser:
                 shot_data = {
                     'club': club,
                     'distance': distance,
-                    'sequenceNumber': len(rounds_dict[round_key]['holes'][hole_num]) + 1
+                    'sequenceNumber': len(shots_list) + 1
                 }
                 
                 # Optional launch monitor data
-                if 'CarryDistance' in row and row['CarryDistance']:
-                    try:
-                        shot_data['carryDistance'] = int(float(row['CarryDistance']))
-                    except:
-                        pass
-                
-                if 'LaunchAngle' in row and row['LaunchAngle']:
-                    try:
-                        shot_data['launchAngle'] = float(row['LaunchAngle'])
-                    except:
-                        pass
-                
-                if 'BallSpeed' in row and row['BallSpeed']:
-                    try:
-                        shot_data['ballSpeed'] = float(row['BallSpeed'])
-                    except:
-                        pass
-                
-                if 'SideSpun' in row and row['SideSpun']:
-                    try:
-                        shot_data['spinRate'] = abs(float(row['SideSpun']))
-                    except:
-                        pass
+                for indexes, key, convert in optional_fields:
+                    for index in indexes:
+                        value = convert(_cell(row, index))
+                        if value is not None:
+                            shot_data[key] = value
+                            break
                 
-                rounds_dict[round_key]['holes'][hole_num].append(shot_data)
+                shots_list.append(shot_data)
                 
             except Exception as e:
                 self.errors.append(f"Row {row_num}: Error parsing row - {str(e)}")
                 continue
         
-        # Convert to normalized format
-        rounds_list = []
-        for round_key, round_data in rounds_dict.items():
-            holes_list = [
-                {
-                    'holeNumber': hole_num,
-                    'shots': shots
-                }
-                for hole_num, shots in sorted(round_data['holes'].items())
-            ]
-            rounds_list.append({
-                'date': round_data['date'],
-                'courseName': round_data['courseName'],
-                'holes': holes_list
-            })
-        
-        return {
-            'rounds': rounds_list,
-            'sourceDevice': 'Garmin R10',
-            'importedAt': datetime.now().isoformat(),
-            'errors': self.errors,
-            'warnings': self.warnings
-        }
+        return self._finalize_rounds(rounds_dict, 'Garmin R10', now)
     
     def _parse_garmin_r10_json(self, content: str) -> Dict:
         """Parse Garmin R10 JSON export."""
+        now = datetime.now()
         try:
-            data = json.loads(content)
+            data = self._load_json(content)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON: {str(e)}")
         
@@ -306,17 +526,17 @@ class LaunchMonitorParser:
                 
                 try:
                     date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()
-                except:
-                    try:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    except:
+                except (ValueError, TypeError, AttributeError):
+                    date_obj = _parse_iso_date(date_str) if isinstance(date_str, str) else None
+                    if date_obj is None:
                         self.errors.append(f"Round {round_idx + 1}: Invalid date format")
                         continue
                 
-                round_key = f"{date_obj.isoformat()}_{course}"
+                round_key = (date_obj, str(course))
                 
-                if round_key not in rounds_dict:
-                    rounds_dict[round_key] = {
+                round_entry = rounds_dict.get(round_key)
+                if round_entry is None:
+                    round_entry = rounds_dict[round_key] = {
                         'date': date_obj.isoformat(),
                         'courseName': course,
                         'holes': {}
@@ -333,531 +553,287 @@ class LaunchMonitorParser:
                     hole_num = shot.get('Hole') or shot.get('hole', 1)
                     try:
                         hole_num = int(hole_num) if hole_num else 1
-                    except:
+                    except (ValueError, TypeError, OverflowError):
                         hole_num = 1
                     
-                    if hole_num not in rounds_dict[round_key]['holes']:
-                        rounds_dict[round_key]['holes'][hole_num] = []
+                    shots_list = round_entry['holes'].setdefault(hole_num, [])
                     
                     distance = shot.get('TotalDistance') or shot.get('Distance') or shot.get('totalDistance') or shot.get('distance')
+                    distance = _toint(distance)
                     if not distance:
                         continue
                     
-                    try:
-                        distance = int(float(distance))
-                    except:
-                        continue
-                    
                     shot_normalized = {
                         'club': str(club),
                         'distance': distance,
-                        'sequenceNumber': len(rounds_dict[round_key]['holes'][hole_num]) + 1
+                        'sequenceNumber': len(shots_list) + 1
                     }
                     
                     # Optional fields
-                    for field in ['CarryDistance', 'LaunchAngle', 'BallSpeed', 'SideSpun']:
-                        field_lower = field.lower()
-                        value = shot.get(field) or shot.get(field_lower)
-                        if value:
-                            try:
-                                if field == 'CarryDistance':
-                                    shot_normalized['carryDistance'] = int(float(value))
-                                elif field == 'LaunchAngle':
-                                    shot_normalized['launchAngle'] = float(value)
-                                elif field == 'BallSpeed':
-                                    shot_normalized['ballSpeed'] = float(value)
-                                elif field == 'SideSpun':
-                                    shot_normalized['spinRate'] = abs(float(value))
-                            except:
-                                pass
+                    for field, key, convert in _GARMIN_JSON_FIELDS:
+                        value = convert(shot.get(field) or shot.get(field.lower()))
+                        if value is not None:
+                            shot_normalized[key] = value
                     
-                    rounds_dict[round_key]['holes'][hole_num].append(shot_normalized)
+                    shots_list.append(shot_normalized)
                 
             except Exception as e:
                 self.errors.append(f"Round {round_idx + 1}: Error - {str(e)}")
                 continue
         
-        # Convert to normalized format
-        rounds_list = []
-        for round_key, round_data in rounds_dict.items():
-            holes_list = [
-                {
-                    'holeNumber': hole_num,
-                    'shots': shots
-                }
-                for hole_num, shots in sorted(round_data['holes'].items())
-            ]
-            rounds_list.append({
-                'date': round_data['date'],
-                'courseName': round_data['courseName'],
-                'holes': holes_list
-            })
-        
-        return {
-            'rounds': rounds_list,
-            'sourceDevice': 'Garmin R10',
-            'importedAt': datetime.now().isoformat(),
-            'errors': self.errors,
-            'warnings': self.warnings
-        }
+        return self._finalize_rounds(rounds_dict, 'Garmin R10', now)
     
     def _parse_skytrak_csv(self, content: str) -> Dict:
         """Parse SkyTrak+ CSV export."""
-        reader = csv.DictReader(StringIO(content))
+        now = datetime.now()
+        columns, rows = _read_csv(content)
+        datetime_index = columns.get('DateTime')
+        club_index = columns.get('Club')
+        # Prefer TotalDistance
+        distance_indexes = _column_indexes(columns, ['TotalDistance', 'CarryDistance'])
+        optional_fields = _resolve_fields(columns, _SKYTRAK_FIELDS)
         rounds_dict = {}
         current_date = None
         
-        for row_num, row in enumerate(reader, start=2):
+        for row_num, row in enumerate(rows, start=2):
             try:
                 # Parse datetime
-                datetime_str = row.get('DateTime', '').strip()
+                datetime_str = _cell(row, datetime_index).strip()
                 if datetime_str:
-                    try:
-                        dt = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
-                    except:
-                        try:
-                            dt = datetime.strptime(datetime_str, '%m/%d/%Y %H:%M:%S')
-                        except:
-                            dt = datetime.now()
+                    dt = _fast_parse_datetime(datetime_str) or now
                     current_date = dt.date()
                 elif not current_date:
-                    current_date = datetime.now().date()
+                    current_date = now.date()
                 
-                club = row.get('Club', '').strip()
+                club = _cell(row, club_index).strip()
                 if not club:
                     self.warnings.append(f"Row {row_num}: Missing club, skipping")
                     continue
                 
-                # Get distance (prefer TotalDistance)
+                # Get distance
                 distance = None
-                for dist_field in ['TotalDistance', 'CarryDistance']:
-                    if dist_field in row and row[dist_field]:
-                        try:
-                            distance = int(float(row[dist_field]))
-                            break
-                        except:
-                            continue
+                for index in distance_indexes:
+                    distance = _toint(_cell(row, index))
+                    if distance is not None:
+                        break
                 
                 if not distance:
                     self.warnings.append(f"Row {row_num}: No valid distance found")
                     continue
                 
-                round_key = f"{current_date.isoformat()}_SkyTrak Session"
+                round_key = current_date
                 
-                if round_key not in rounds_dict:
-                    rounds_dict[round_key] = {
+                round_entry = rounds_dict.get(round_key)
+                if round_entry is None:
+                    round_entry = rounds_dict[round_key] = {
                         'date': current_date.isoformat(),
                         'courseName': 'SkyTrak Practice Session',
                         'holes': {1: []}  # SkyTrak typically doesn't have holes
                     }
                 
+                shots_list = round_entry['holes'][1]
                 shot_data = {
                     'club': club,
                     'distance': distance,
-                    'sequenceNumber': len(rounds_dict[round_key]['holes'][1]) + 1
+                    'sequenceNumber': len(shots_list) + 1
                 }
                 
                 # Optional fields
-                if 'CarryDistance' in row and row['CarryDistance']:
-                    try:
-                        shot_data['carryDistance'] = int(float(row['CarryDistance']))
-                    except:
-                        pass
-                
-                if 'LaunchAngle' in row and row['LaunchAngle']:
-                    try:
-                        shot_data['launchAngle'] = float(row['LaunchAngle'])
-                    except:
-                        pass
-                
-                if 'BallSpeed' in row and row['BallSpeed']:
-                    try:
-                        shot_data['ballSpeed'] = float(row['BallSpeed'])
-                    except:
-                        pass
-                
-                if 'TotalSpin' in row and row['TotalSpin']:
-                    try:
-                        shot_data['spinRate'] = abs(float(row['TotalSpin']))
-                    except:
-                        pass
-                
-                if 'SmashFactor' in row and row['SmashFactor']:
-                    try:
-                        shot_data['smashFactor'] = float(row['SmashFactor'])
-                    except:
-                        pass
+                for indexes, key, convert in optional_fields:
+                    for index in indexes:
+                        value = convert(_cell(row, index))
+                        if value is not None:
+                            shot_data[key] = value
+                            break
                 
-                rounds_dict[round_key]['holes'][1].append(shot_data)
+                shots_list.append(shot_data)
                 
             except Exception as e:
                 self.errors.append(f"Row {row_num}: Error - {str(e)}")
                 continue
         
-        # Convert to normalized format
-        rounds_list = []
-        for round_key, round_data in rounds_dict.items():
-            rounds_list.append({
-                'date': round_data['date'],
-                'courseName': round_data['courseName'],
-                'holes': [
-                    {
-                        'holeNumber': 1,
-                        'shots': round_data['holes'][1]
-                    }
-                ]
-            })
-        
-        return {
-            'rounds': rounds_list,
-            'sourceDevice': 'SkyTrak+',
-            'importedAt': datetime.now().isoformat(),
-            'errors': self.errors,
-            'warnings': self.warnings
-        }
+        return self._finalize_rounds(rounds_dict, 'SkyTrak+', now)
     
     def _parse_mevo_csv(self, content: str) -> Dict:
         """Parse Flightscope Mevo+ CSV export."""
-        reader = csv.DictReader(StringIO(content))
+        now = datetime.now()
+        columns, rows = _read_csv(content)
+        date_index = columns.get('Date')
+        time_index = columns.get('Time')
+        club_index = columns.get('Club')
+        # Prefer Total, fallback to Carry
+        distance_indexes = _column_indexes(columns, ['Total', 'Carry'])
+        optional_fields = _resolve_fields(columns, _MEVO_FIELDS)
         rounds_dict = {}
         current_date = None
         
-        for row_num, row in enumerate(reader, start=2):
+        for row_num, row in enumerate(rows, start=2):
             try:
                 # Parse date/time
-                date_str = row.get('Date', '').strip()
-                time_str = row.get('Time', '').strip()
+                date_str = _cell(row, date_index).strip()
+                time_str = _cell(row, time_index).strip()
                 
                 if date_str:
-                    try:
-                        if time_str:
-                            dt = datetime.strptime(f"{date_str} {time_str}", '%Y-%m-%d %H:%M:%S')
-                        else:
-                            dt = datetime.strptime(date_str, '%Y-%m-%d')
-                        current_date = dt.date()
-                    except:
-                        try:
-                            dt = datetime.strptime(date_str, '%m/%d/%Y')
-                            current_date = dt.date()
-                        except:
-                            current_date = datetime.now().date()
+                    # An ISO date only counts when the time (if any) is valid too;
+                    # a US date is accepted on its own
+                    iso_date = None
+                    if not time_str or _parse_time(time_str):
+                        iso_date = _parse_iso_date(date_str)
+                    current_date = iso_date or _parse_mdy_date(date_str) or now.date()
                 elif not current_date:
-                    current_date = datetime.now().date()
+                    current_date = now.date()
                 
-                club = row.get('Club', '').strip()
+                club = _cell(row, club_index).strip()
                 if not club:
                     self.warnings.append(f"Row {row_num}: Missing club, skipping")
                     continue
                 
-                # Get distance (prefer Total, fallback to Carry)
+                # Get distance
                 distance = None
-                for dist_field in ['Total', 'Carry']:
-                    if dist_field in row and row[dist_field]:
-                        try:
-                            distance = int(float(row[dist_field]))
-                            break
-                        except:
-                            continue
+                for index in distance_indexes:
+                    distance = _toint(_cell(row, index))
+                    if distance is not None:
+                        break
                 
                 if not distance:
                     self.warnings.append(f"Row {row_num}: No valid distance found")
                     continue
                 
-                round_key = f"{current_date.isoformat()}_Mevo Session"
+                round_key = current_date
                 
-                if round_key not in rounds_dict:
-                    rounds_dict[round_key] = {
+                round_entry = rounds_dict.get(round_key)
+                if round_entry is None:
+                    round_entry = rounds_dict[round_key] = {
                         'date': current_date.isoformat(),
                         'courseName': 'Mevo+ Practice Session',
                         'holes': {1: []}
                     }
                 
+                shots_list = round_entry['holes'][1]
                 shot_data = {
                     'club': club,
                     'distance': distance,
-                    'sequenceNumber': len(rounds_dict[round_key]['holes'][1]) + 1
+                    'sequenceNumber': len(shots_list) + 1
                 }
                 
                 # Optional fields
-                if 'Carry' in row and row['Carry']:
-                    try:
-                        shot_data['carryDistance'] = int(float(row['Carry']))
-                    except:
-                        pass
-                
-                if 'Launch Angle' in row and row['Launch Angle']:
-                    try:
-                        shot_data['launchAngle'] = float(row['Launch Angle'])
-                    except:
-                        pass
-                
-                if 'Ball Speed' in row and row['Ball Speed']:
-                    try:
-                        shot_data['ballSpeed'] = float(row['Ball Speed'])
-                    except:
-                        pass
-                
-                if 'Spin Rate' in row and row['Spin Rate']:
-                    try:
-                        shot_data['spinRate'] = abs(float(row['Spin Rate']))
-                    except:
-                        pass
-                
-                if 'Smash Factor' in row and row['Smash Factor']:
-                    try:
-                        shot_data['smashFactor'] = float(row['Smash Factor'])
-                    except:
-                        pass
+                for indexes, key, convert in optional_fields:
+                    for index in indexes:
+                        value = convert(_cell(row, index))
+                        if value is not None:
+                            shot_data[key] = value
+                            break
                 
-                rounds_dict[round_key]['holes'][1].append(shot_data)
+                shots_list.append(shot_data)
                 
             except Exception as e:
                 self.errors.append(f"Row {row_num}: Error - {str(e)}")
                 continue
         
-        # Convert to normalized format
-        rounds_list = []
-        for round_key, round_data in rounds_dict.items():
-            rounds_list.append({
-                'date': round_data['date'],
-                'courseName': round_data['courseName'],
-                'holes': [
-                    {
-                        'holeNumber': 1,
-                        'shots': round_data['holes'][1]
-                    }
-                ]
-            })
-        
-        return {
-            'rounds': rounds_list,
-            'sourceDevice': 'Flightscope Mevo+',
-            'importedAt': datetime.now().isoformat(),
-            'errors': self.errors,
-            'warnings': self.warnings
-        }
+        return self._finalize_rounds(rounds_dict, 'Flightscope Mevo+', now)
     
     def _parse_generic_launch_monitor_csv(self, content: str) -> Dict:
         """Parse generic launch monitor CSV with Date, Time, Club Head Speed, Total Spin, etc."""
-        reader = csv.DictReader(StringIO(content))
+        now = datetime.now()
+        columns, rows = _read_csv(content)
+        date_index = columns.get('Date')
+        time_index = columns.get('Time')
+        club_index = columns.get('Club')
+        # Prefer Total Distance, fallback to Carry Distance
+        total_indexes = _column_indexes(columns, ['Total Distance (yd)', 'Total Distance', 'TotalDistance'])
+        carry_indexes = _column_indexes(columns, ['Carry Distance (yd)', 'Carry Distance', 'CarryDistance'])
+        optional_fields = _resolve_fields(columns, _GENERIC_FIELDS)
         rounds_dict = {}
         first_date = None
         round_key = "Launch Monitor Practice Session"
         
-        for row_num, row in enumerate(reader, start=2):
+        for row_num, row in enumerate(rows, start=2):
             try:
                 # Parse date and time (for timestamp, but group all into one round)
-                date_str = row.get('Date', '').strip().strip('"')
-                time_str = row.get('Time', '').strip().strip('"')
+                date_str = _cell(row, date_index).strip(_STRIP_CHARS)
+                time_str = _cell(row, time_index).strip(_STRIP_CHARS)
                 
                 # Store first valid date for the round date
                 if date_str and not first_date:
-                    try:
-                        # Try ISO format first (YYYY-MM-DD)
-                        if time_str:
-                            dt = datetime.strptime(f"{date_str} {time_str}", '%Y-%m-%d %H:%M:%S')
-                        else:
-                            dt = datetime.strptime(date_str, '%Y-%m-%d')
-                        first_date = dt.date()
-                    except:
-                        try:
-                            # Try US format (MM/DD/YYYY)
-                            if time_str:
-                                dt = datetime.strptime(f"{date_str} {time_str}", '%m/%d/%Y %H:%M:%S')
-                            else:
-                                dt = datetime.strptime(date_str, '%m/%d/%Y')
-                            first_date = dt.date()
-                        except:
-                            pass
+                    # ISO (YYYY-MM-DD) or US (MM/DD/YYYY), with a valid time if one is given
+                    if not time_str or _parse_time(time_str):
+                        first_date = _fast_parse_date(date_str)
                 
                 # Get club name
-                club = row.get('Club', '').strip().strip('"')
+                club = _cell(row, club_index).strip(_STRIP_CHARS)
                 if not club:
                     self.warnings.append(f"Row {row_num}: Missing club, skipping")
                     continue
                 
-                # Get distance (prefer Total Distance, fallback to Carry Distance)
+                # Get distance
                 distance = None
-                for dist_field in ['Total Distance (yd)', 'Total Distance', 'TotalDistance']:
-                    if dist_field in row and row[dist_field]:
-                        try:
-                            dist_val = row[dist_field].strip().strip('"')
-                            distance = int(float(dist_val))
-                            break
-                        except:
-                            continue
+                for index in total_indexes:
+                    distance = _toint(_cell(row, index))
+                    if distance is not None:
+                        break
                 
                 # If no total distance, try carry distance
                 if not distance:
-                    for dist_field in ['Carry Distance (yd)', 'Carry Distance', 'CarryDistance']:
-                        if dist_field in row and row[dist_field]:
-                            try:
-                                dist_val = row[dist_field].strip().strip('"')
-                                distance = int(float(dist_val))
-                                break
-                            except:
-                                continue
+                    for index in carry_indexes:
+                        distance = _toint(_cell(row, index))
+                        if distance is not None:
+                            break
                 
                 if not distance:
                     self.warnings.append(f"Row {row_num}: No valid distance found, skipping")
                     continue
                 
                 # Group all shots into a single round
-                if round_key not in rounds_dict:
+                round_entry = rounds_dict.get(round_key)
+                if round_entry is None:
                     # Use first date found, or today's date if none found
-                    round_date = first_date if first_date else datetime.now().date()
-                    rounds_dict[round_key] = {
+                    round_date = first_date if first_date else now.date()
+                    round_entry = rounds_dict[round_key] = {
                         'date': round_date.isoformat(),
                         'courseName': 'Launch Monitor Practice Session',
                         'holes': {1: []}  # All shots go to hole 1 (practice session)
                     }
                 
+                shots_list = round_entry['holes'][1]
                 shot_data = {
                     'club': club,
                     'distance': distance,
-                    'sequenceNumber': len(rounds_dict[round_key]['holes'][1]) + 1
+                    'sequenceNumber': len(shots_list) + 1
                 }
                 
                 # Extract optional launch monitor data
-                # Carry Distance
-                for field in ['Carry Distance (yd)', 'Carry Distance', 'CarryDistance']:
-                    if field in row and row[field]:
-                        try:
-                            val = row[field].strip().strip('"')
-                            shot_data['carryDistance'] = int(float(val))
-                            break
-                        except:
-                            pass
-                
-                # Launch Angle
-                for field in ['Launch Angle (deg)', 'Launch Angle', 'LaunchAngle']:
-                    if field in row and row[field]:
-                        try:
-                            val = row[field].strip().strip('"')
-                            shot_data['launchAngle'] = float(val)
-                            break
-                        except:
-                            pass
-                
-                # Ball Speed
-                for field in ['Ball Speed (mph)', 'Ball Speed', 'BallSpeed']:
-                    if field in row and row[field]:
-                        try:
-                            val = row[field].strip().strip('"')
-                            shot_data['ballSpeed'] = float(val)
-                            break
-                        except:
-                            pass
-                
-                # Club Head Speed
-                for field in ['Club Head Speed (mph)', 'Club Head Speed', 'ClubHeadSpeed']:
-                    if field in row and row[field]:
-                        try:
-                            val = row[field].strip().strip('"')
-                            shot_data['clubHeadSpeed'] = float(val)
-                            break
-                        except:
-                            pass
-                
-                # Total Spin / Spin Rate
-                for field in ['Total Spin (rpm)', 'Total Spin', 'TotalSpin', 'Spin Rate (rpm)', 'Spin Rate']:
-                    if field in row and row[field]:
-                        try:
-                            val = row[field].strip().strip('"')
-                            shot_data['spinRate'] = abs(float(val))
-                            break
-                        except:
-                            pass
-                
-                # Smash Factor
-                for field in ['Smash Factor', 'SmashFactor']:
-                    if field in row and row[field]:
-                        try:
-                            val = row[field].strip().strip('"')
-                            shot_data['smashFactor'] = float(val)
-                            break
-                        except:
-                            pass
-                
-                # Launch Direction
-                for field in ['Launch Direction (deg)', 'Launch Direction', 'LaunchDirection']:
-                    if field in row and row[field]:
-                        try:
-                            val = row[field].strip().strip('"')
-                            shot_data['launchDirection'] = float(val)
-                            break
-                        except:
-                            pass
-                
-                # Peak Height
-                for field in ['Peak Height (yd)', 'Peak Height', 'PeakHeight']:
-                    if field in row and row[field]:
-                        try:
-                            val = row[field].strip().strip('"')
-                            shot_data['peakHeight'] = float(val)
-                            break
-                        except:
-                            pass
-                
-                # Accuracy
-                for field in ['Accuracy (yd)', 'Accuracy']:
-                    if field in row and row[field]:
-                        try:
-                            val = row[field].strip().strip('"')
-                            shot_data['accuracy'] = float(val)
+                for indexes, key, convert in optional_fields:
+                    for index in indexes:
+                        value = convert(_cell(row, index))
+                        if value is not None:
+                            shot_data[key] = value
                             break
-                        except:
-                            pass
                 
                 # Store timestamp if available
                 if date_str and time_str:
-                    try:
-                        dt = datetime.strptime(f"{date_str} {time_str}", '%Y-%m-%d %H:%M:%S')
-                        shot_data['timestamp'] = dt.isoformat()
-                    except:
-                        pass
-                
-                # Infer shot shape from launch direction and distance metrics
-                shot_shape = self._infer_shot_shape(
-                    launch_direction=shot_data.get('launchDirection'),
-                    carry_distance=shot_data.get('carryDistance'),
-                    total_distance=shot_data.get('distance')  # This is total distance
-                )
-                if shot_shape:
-                    shot_data['shotShape'] = shot_shape
+                    shot_date = _parse_iso_date(date_str)
+                    shot_time = _parse_time(time_str)
+                    if shot_date and shot_time is not None:
+                        shot_data['timestamp'] = datetime.combine(shot_date, shot_time).isoformat()
                 
-                rounds_dict[round_key]['holes'][1].append(shot_data)
+                shots_list.append(shot_data)
                 
             except Exception as e:
                 self.errors.append(f"Row {row_num}: Error - {str(e)}")
                 continue
         
-        # Convert to normalized format
-        rounds_list = []
-        for round_key, round_data in rounds_dict.items():
-            rounds_list.append({
-                'date': round_data['date'],
-                'courseName': round_data['courseName'],
-                'holes': [
-                    {
-                        'holeNumber': 1,
-                        'shots': round_data['holes'][1]
-                    }
-                ]
-            })
+        # Infer shot shape from launch direction and distance metrics, if the export has them
+        if any(key == 'launchDirection' for _, key, _ in optional_fields):
+            for round_data in rounds_dict.values():
+                self._infer_shot_shapes(round_data['holes'][1])
         
-        return {
-            'rounds': rounds_list,
-            'sourceDevice': 'Generic Launch Monitor',
-            'importedAt': datetime.now().isoformat(),
-            'errors': self.errors,
-            'warnings': self.warnings
-        }
+        return self._finalize_rounds(rounds_dict, 'Generic Launch Monitor', now)
     
     def _parse_arccos_json(self, content: str) -> Dict:
         """Parse Arccos Caddie JSON export."""
+        now = datetime.now()
         try:
-            data = json.loads(content)
+            data = self._load_json(content)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON: {str(e)}")
         
@@ -877,51 +853,63 @@ class LaunchMonitorParser:
         else:
             raise ValueError("Unexpected JSON structure")
         
+        # Exports use one spelling per field; aliases that no shot uses can't
+        # change the result of the lookups, so resolve them once up front
+        present_keys = set()
+        for shot in shots_data:
+            if isinstance(shot, dict):
+                present_keys.update(shot)
+        timestamp_keys = _present_aliases(('timestamp', 'Timestamp'), present_keys)
+        course_keys = _present_aliases(('course', 'Course'), present_keys)
+        hole_keys = _present_aliases(('hole', 'Hole', 'holeNumber'), present_keys)
+        club_keys = _present_aliases(('clubId', 'club', 'Club'), present_keys)
+        distance_keys = _present_aliases(('distance', 'Distance'), present_keys)
+        
         rounds_dict = {}
         
         for shot_idx, shot in enumerate(shots_data):
             try:
                 # Parse timestamp
-                timestamp = shot.get('timestamp') or shot.get('Timestamp')
+                timestamp = _first_value(shot, timestamp_keys)
                 if timestamp:
                     try:
                         dt = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
-                    except:
+                    except ValueError:
                         try:
                             dt = datetime.fromtimestamp(int(timestamp) / 1000)  # Assume milliseconds
-                        except:
-                            dt = datetime.now()
+                        except (ValueError, TypeError, OverflowError, OSError):
+                            dt = now
                 else:
-                    dt = datetime.now()
+                    dt = now
                 
                 date_obj = dt.date()
                 
                 # Get course name
-                course = shot.get('course') or shot.get('Course') or 'Unknown Course'
+                course = _first_value(shot, course_keys) or 'Unknown Course'
                 if isinstance(course, dict):
                     course = course.get('name') or 'Unknown Course'
                 
-                round_key = f"{date_obj.isoformat()}_{course}"
+                round_key = (date_obj, str(course))
                 
-                if round_key not in rounds_dict:
-                    rounds_dict[round_key] = {
+                round_entry = rounds_dict.get(round_key)
+                if round_entry is None:
+                    round_entry = rounds_dict[round_key] = {
                         'date': date_obj.isoformat(),
                         'courseName': str(course),
                         'holes': {}
                     }
                 
                 # Get hole number
-                hole_num = shot.get('hole') or shot.get('Hole') or shot.get('holeNumber') or 1
+                hole_num = _first_value(shot, hole_keys) or 1
                 try:
                     hole_num = int(hole_num) if hole_num else 1
-                except:
+                except (ValueError, TypeError, OverflowError):
                     hole_num = 1
                 
-                if hole_num not in rounds_dict[round_key]['holes']:
-                    rounds_dict[round_key]['holes'][hole_num] = []
+                shots_list = round_entry['holes'].setdefault(hole_num, [])
                 
                 # Get club (may be ID, need to map or use as-is)
-                club = shot.get('clubId') or shot.get('club') or shot.get('Club') or ''
+                club = _first_value(shot, club_keys) or ''
                 if isinstance(club, dict):
                     club = club.get('name') or club.get('id') or ''
                 
@@ -930,63 +918,40 @@ class LaunchMonitorParser:
                     continue
                 
                 # Get distance
-                distance = shot.get('distance') or shot.get('Distance')
+                distance = _first_value(shot, distance_keys)
                 if not distance:
                     self.warnings.append(f"Shot {shot_idx + 1}: Missing distance, skipping")
                     continue
                 
-                try:
-                    distance = int(float(distance))
-                except:
+                distance = _toint(distance)
+                if distance is None:
                     self.warnings.append(f"Shot {shot_idx + 1}: Invalid distance")
                     continue
                 
                 shot_data = {
                     'club': str(club),
                     'distance': distance,
-                    'sequenceNumber': len(rounds_dict[round_key]['holes'][hole_num]) + 1
+                    'sequenceNumber': len(shots_list) + 1
                 }
                 
                 # Optional fields
                 if 'accuracy' in shot:
                     try:
                         shot_data['accuracy'] = float(shot['accuracy'])
-                    except:
+                    except (ValueError, TypeError, OverflowError):
                         pass
                 
                 if 'dispersion' in shot:
                     try:
                         shot_data['metadata'] = {'dispersion': float(shot['dispersion'])}
-                    except:
+                    except (ValueError, TypeError, OverflowError):
                         pass
                 
-                rounds_dict[round_key]['holes'][hole_num].append(shot_data)
+                shots_list.append(shot_data)
                 
             except Exception as e:
                 self.errors.append(f"Shot {shot_idx + 1}: Error - {str(e)}")
                 continue
         
-        # Convert to normalized format
-        rounds_list = []
-        for round_key, round_data in rounds_dict.items():
-            holes_list = [
-                {
-                    'holeNumber': hole_num,
-                    'shots': shots
-                }
-                for hole_num, shots in sorted(round_data['holes'].items())
-            ]
-            rounds_list.append({
-                'date': round_data['date'],
-                'courseName': round_data['courseName'],
-                'holes': holes_list
-            })
-        
-        return {
-            'rounds': rounds_list,
-            'sourceDevice': 'Arccos Caddie',
-            'importedAt': datetime.now().isoformat(),
-            'errors': self.errors,
-            'warnings': self.warnings
-        }
+        return self._finalize_rounds(rounds_dict, 'Arccos Caddie', now)
 
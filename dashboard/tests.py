@@ -1,3 +1,315 @@
-from django.test import TestCase
+import json
 
+import numpy as np
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from sklearn.neighbors import KNeighborsClassifier
 
+from .models import Club, Shot
+from .parsers import LaunchMonitorParser
+from .views import nearest_neighbors, neighbor_vote, weighted_distances
+
+
+def _shots(result):
+    """All shots of a parse result, in round and hole order."""
+    return [
+        shot
+        for round_data in result['rounds']
+        for hole in round_data['holes']
+        for shot in hole['shots']
+    ]
+
+
+class DetectDeviceTypeTests(SimpleTestCase):
+    def setUp(self):
+        self.parser = LaunchMonitorParser()
+    
+    def test_generic_csv(self):
+        header = 'Date,Time,Club,Club Head Speed (mph),Total Spin (rpm),Total Distance (yd)\n'
+        self.assertEqual(self.parser._detect_device_type(header, '.csv'), 'Generic Launch Monitor')
+    
+    def test_skytrak_csv(self):
+        header = 'DateTime,Club,BallSpeed,SmashFactor,TotalDistance\n'
+        self.assertEqual(self.parser._detect_device_type(header, '.csv'), 'SkyTrak+')
+    
+    def test_mevo_csv(self):
+        header = 'Date,Time,Club,Carry,Total,Spin Rate\n'
+        self.assertEqual(self.parser._detect_device_type(header, '.csv'), 'Flightscope Mevo+')
+    
+    def test_garmin_csv(self):
+        header = '\ufeffDate,Course,Hole,Club,TotalDistance\n'
+        self.assertEqual(self.parser._detect_device_type(header, '.csv'), 'Garmin R10')
+    
+    def test_arccos_json(self):
+        content = json.dumps({'rounds': [{'shots': [{'clubId': '7i', 'distance': 150}]}]})
+        self.assertEqual(self.parser._detect_device_type(content, '.json'), 'Arccos Caddie')
+    
+    def test_garmin_json(self):
+        content = json.dumps([{'Date': '2024-05-01', 'Course': 'Pebble', 'Shots': []}])
+        self.assertEqual(self.parser._detect_device_type(content, '.json'), 'Garmin R10')
+    
+    def test_unrecognised_content_falls_back_to_garmin(self):
+        self.assertEqual(self.parser._detect_device_type('not json', '.json'), 'Garmin R10')
+        self.assertEqual(self.parser._detect_device_type('A,B,C\n1,2,3\n', '.csv'), 'Garmin R10')
+
+
+class ParserTests(SimpleTestCase):
+    def setUp(self):
+        self.parser = LaunchMonitorParser()
+    
+    def test_garmin_csv(self):
+        content = (
+            'Date,Course,Hole,Club,TotalDistance,CarryDistance,BallSpeed,SideSpun\n'
+            '2024-05-01,Pebble,Hole 1,Driver,250,235,150.5,-300\n'
+            '2024-05-01,Pebble,Hole 1,7 Iron,,148,110,\n'
+            '2024-05-01,Pebble,2,PW,,,,\n'
+            '05/02/2024,,3,9 Iron,130,,,\n'
+            ',Pebble,4,Driver,240,,,\n'
+        )
+        result = self.parser.parse(content, '.csv')
+        
+        self.assertEqual(result['sourceDevice'], 'Garmin R10')
+        self.assertEqual(
+            [(r['date'], r['courseName']) for r in result['rounds']],
+            [('2024-05-01', 'Pebble'), ('2024-05-02', 'Unknown Course')],
+        )
+        self.assertEqual(
+            _shots(result),
+            [
+                {'club': 'Driver', 'distance': 250, 'sequenceNumber': 1,
+                 'carryDistance': 235, 'ballSpeed': 150.5, 'spinRate': 300.0},
+                # TotalDistance is empty, so the carry distance is used
+                {'club': '7 Iron', 'distance': 148, 'sequenceNumber': 2,
+                 'carryDistance': 148, 'ballSpeed': 110.0},
+                {'club': '9 Iron', 'distance': 130, 'sequenceNumber': 1},
+            ],
+        )
+        self.assertEqual(result['rounds'][0]['holes'][0]['holeNumber'], 1)
+        self.assertEqual(
+            result['warnings'],
+            ['Row 4: No valid distance found', 'Row 6: Missing date or club, skipping'],
+        )
+        self.assertEqual(result['errors'], [])
+    
+    def test_garmin_csv_invalid_date(self):
+        content = 'Date,Course,Club,TotalDistance\nyesterday,Pebble,Driver,250\n'
+        result = self.parser.parse(content, '.csv')
+        
+        self.assertEqual(result['rounds'], [])
+        self.assertEqual(result['errors'], ['Row 2: Invalid date format: yesterday'])
+    
+    def test_garmin_json(self):
+        content = json.dumps({'rounds': [{
+            'Date': '2024-05-01T09:30:00Z',
+            'Course': 'Pebble',
+            'Shots': [
+                {'Club': 'Driver', 'Hole': 1, 'TotalDistance': 250, 'carrydistance': 238},
+                {'Club': '7 Iron', 'Hole': 'x', 'Distance': '150.9'},
+                {'Club': 'PW', 'Hole': 2},
+            ],
+        }]})
+        result = self.parser.parse(content, '.json')
+        
+        self.assertEqual(result['sourceDevice'], 'Garmin R10')
+        self.assertEqual(len(result['rounds']), 1)
+        self.assertEqual(result['rounds'][0]['date'], '2024-05-01')
+        self.assertEqual(
+            _shots(result),
+            [
+                {'club': 'Driver', 'distance': 250, 'sequenceNumber': 1, 'carryDistance': 238},
+                # An unreadable hole number falls back to hole 1
+                {'club': '7 Iron', 'distance': 150, 'sequenceNumber': 2},
+            ],
+        )
+    
+    def test_skytrak_csv(self):
+        content = (
+            'DateTime,Club,TotalDistance,CarryDistance,BallSpeed,TotalSpin,SmashFactor\n'
+            '2024-05-01 10:15:00,Driver,260,245,155,-2500,1.48\n'
+            ',7 Iron,,150,112,,\n'
+            '2024-05-03 08:00:00,PW,,,,,\n'
+        )
+        result = self.parser.parse(content, '.csv')
+        
+        self.assertEqual(result['sourceDevice'], 'SkyTrak+')
+        self.assertEqual(len(result['rounds']), 1)
+        self.assertEqual(result['rounds'][0]['date'], '2024-05-01')
+        self.assertEqual(result['rounds'][0]['courseName'], 'SkyTrak Practice Session')
+        self.assertEqual(
+            _shots(result),
+            [
+                {'club': 'Driver', 'distance': 260, 'sequenceNumber': 1, 'carryDistance': 245,
+                 'ballSpeed': 155.0, 'spinRate': 2500.0, 'smashFactor': 1.48},
+                # A row without a date belongs to the previous row's session
+                {'club': '7 Iron', 'distance': 150, 'sequenceNumber': 2, 'carryDistance': 150,
+                 'ballSpeed': 112.0},
+            ],
+        )
+        self.assertEqual(result['warnings'], ['Row 4: No valid distance found'])
+    
+    def test_mevo_csv(self):
+        content = (
+            'Date,Time,Club,Total,Carry,Ball Speed,Spin Rate,Smash Factor\n'
+            '2024-05-01,10:15:00,Driver,255,240,152,2600,1.47\n'
+            '05/02/2024,,7 Iron,,151,,,\n'
+            ',,,200,,,,\n'
+        )
+        result = self.parser.parse(content, '.csv')
+        
+        self.assertEqual(result['sourceDevice'], 'Flightscope Mevo+')
+        self.assertEqual(
+            [(r['date'], r['courseName']) for r in result['rounds']],
+            [('2024-05-01', 'Mevo+ Practice Session'), ('2024-05-02', 'Mevo+ Practice Session')],
+        )
+        self.assertEqual(
+            _shots(result),
+            [
+                {'club': 'Driver', 'distance': 255, 'sequenceNumber': 1, 'carryDistance': 240,
+                 'ballSpeed': 152.0, 'spinRate': 2600.0, 'smashFactor': 1.47},
+                {'club': '7 Iron', 'distance': 151, 'sequenceNumber': 1, 'carryDistance': 151},
+            ],
+        )
+        self.assertEqual(result['warnings'], ['Row 4: Missing club, skipping'])
+    
+    def test_generic_csv(self):
+        content = (
+            'Date,Time,Club,Club Head Speed (mph),Total Spin (rpm),Total Distance (yd),'
+            'Carry Distance (yd),Launch Direction (deg)\n'
+            '"2024-05-01","10:15:00","Driver",105,2700,250,240,-2\n'
+            '2024-05-01,10:16:00,7 Iron,85,6500,,150,8\n'
+            '2024-05-01,10:17:00,5 Iron,90,5000,150,170,-12\n'
+            '2024-05-01,10:18:00,PW,,,,,\n'
+        )
+        result = self.parser.parse(content, '.csv')
+        
+        self.assertEqual(result['sourceDevice'], 'Generic Launch Monitor')
+        self.assertEqual(len(result['rounds']), 1)
+        self.assertEqual(result['rounds'][0]['date'], '2024-05-01')
+        self.assertEqual(result['rounds'][0]['courseName'], 'Launch Monitor Practice Session')
+        shots = _shots(result)
+        self.assertEqual(
+            shots[0],
+            {'club': 'Driver', 'distance': 250, 'sequenceNumber': 1, 'carryDistance': 240,
+             'clubHeadSpeed': 105.0, 'spinRate': 2700.0, 'launchDirection': -2.0,
+             'timestamp': '2024-05-01T10:15:00', 'shotShape': 'Straight'},
+        )
+        # No total distance, so the carry distance is used
+        self.assertEqual(shots[1]['distance'], 150)
+        self.assertEqual([shot['shotShape'] for shot in shots], ['Straight', 'Fade', 'Hook'])
+        self.assertEqual(result['warnings'], ['Row 5: No valid distance found, skipping'])
+    
+    def test_arccos_json(self):
+        content = json.dumps({'shots': [
+            {'timestamp': '2024-05-01T09:30:00', 'course': {'name': 'Pebble'}, 'hole': 3,
+             'clubId': '7i', 'distance': 152, 'accuracy': '4.5', 'dispersion': 8},
+            {'timestamp': 1714642200000, 'course': 'Pebble', 'holeNumber': 1,
+             'club': {'name': 'Driver'}, 'distance': '248'},
+            {'timestamp': '2024-05-01T09:40:00', 'clubId': 'PW'},
+            {'timestamp': '2024-05-01T09:45:00', 'clubId': 'SW', 'distance': 'far'},
+        ]})
+        result = self.parser.parse(content, '.json')
+        
+        self.assertEqual(result['sourceDevice'], 'Arccos Caddie')
+        first_round = result['rounds'][0]
+        self.assertEqual((first_round['date'], first_round['courseName']), ('2024-05-01', 'Pebble'))
+        self.assertEqual(
+            first_round['holes'][0]['shots'],
+            [{'club': '7i', 'distance': 152, 'sequenceNumber': 1, 'accuracy': 4.5,
+              'metadata': {'dispersion': 8.0}}],
+        )
+        self.assertIn(
+            {'club': 'Driver', 'distance': 248, 'sequenceNumber': 1},
+            _shots(result),
+        )
+        self.assertEqual(
+            result['warnings'],
+            ['Shot 3: Missing distance, skipping', 'Shot 4: Invalid distance'],
+        )
+    
+    def test_unsupported_extension(self):
+        with self.assertRaises(ValueError):
+            self.parser.parse('', '.txt')
+
+
+class NeighborVoteTests(SimpleTestCase):
+    """nearest_neighbors + neighbor_vote must agree with the KNeighborsClassifier they replaced."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n_shots = 60
+        self.X_train = np.column_stack([
+            rng.uniform(50, 280, n_shots),  # distance
+            rng.integers(0, 3, n_shots),    # lie code
+            rng.integers(0, 3, n_shots),    # bend code
+            rng.integers(0, 5, n_shots),    # shot shape code
+        ]).astype(np.float32)
+        self.y_train = rng.integers(0, 6, n_shots)
+        self.queries = np.array([
+            [150.0, 0, 1, 2],
+            [240.0, 2, 0, 4],
+            [90.0, 1, 2, 0],
+            list(self.X_train[7]),  # an exact match with a training shot
+        ])
+    
+    def _sklearn_proba(self, k, query):
+        knn = KNeighborsClassifier(
+            n_neighbors=k,
+            weights='distance',
+            algorithm='brute',
+            metric=lambda a, b: weighted_distances(a[np.newaxis, :], b)[0],
+        )
+        knn.fit(self.X_train.astype(float), self.y_train)
+        return knn.predict_proba(query[np.newaxis, :])[0]
+    
+    def test_matches_kneighbors_classifier(self):
+        for k in (1, 5, 15):
+            for query in self.queries:
+                with self.subTest(k=k, query=query.tolist()):
+                    dists, indices = nearest_neighbors(self.X_train, query, k)
+                    proba = neighbor_vote(dists, self.y_train[indices], 6)
+                    np.testing.assert_allclose(proba, self._sklearn_proba(k, query))
+    
+    def test_neighbors_closest_first(self):
+        dists, indices = nearest_neighbors(self.X_train, self.queries[0], 10)
+        expected = weighted_distances(self.X_train, self.queries[0])
+        self.assertEqual(len(indices), 10)
+        self.assertTrue(np.all(np.diff(dists) >= 0))
+        self.assertEqual(dists[-1], np.sort(expected)[9])
+        np.testing.assert_array_equal(dists, expected[indices])
+
+
+class AddRoundViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('golfer', password='pw')
+        self.club = Club.objects.create(user=self.user, name='7 Iron')
+        self.client.force_login(self.user)
+    
+    def _post(self, **fields):
+        return self.client.post(reverse('add_round'), {'course_name': 'Pebble', **fields})
+    
+    def test_saves_valid_shots_without_warning(self):
+        response = self._post(**{
+            'club[]': [self.club.id, self.club.id],
+            'distance[]': ['150', ''],
+            'shot_shape[]': ['Straight', 'Straight'],
+            'lie[]': ['Fairway', 'Rough'],
+        })
+        
+        self.assertEqual(list(Shot.objects.values_list('distance', flat=True)), [150])
+        self.assertEqual(list(get_messages(response.wsgi_request)), [])
+    
+    def test_reports_skipped_rows(self):
+        response = self._post(**{
+            'club[]': [self.club.id] * 4,
+            'distance[]': ['150', '-20', 'far', '140'],
+            'shot_shape[]': ['Straight'] * 4,
+            'lie[]': ['Fairway'] * 3,  # the last row has no lie
+        })
+        
+        self.assertEqual(list(Shot.objects.values_list('distance', flat=True)), [150])
+        self.assertEqual(
+            [str(message) for message in get_messages(response.wsgi_request)],
+            ['Saved 1 shots. 2 shots with an invalid or negative distance and 1 incomplete shot rows were skipped.'],
+        )
@@ -4,31 +4,44 @@ from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import login, logout
 from django.contrib import messages
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from django.http import JsonResponse, HttpResponse
-from django.db.models import Avg, StdDev, Count, Q
+from django.db import transaction
+from django.db.models import Count, Max, StdDev
 from .models import Club, GolfRound, Shot, LaunchMonitorImport
 from .parsers import LaunchMonitorParser
 import os
 import csv
+import functools
+import hashlib
 import json
+import logging
 import re
+import traceback
 import numpy as np
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.preprocessing import LabelEncoder
 from sklearn.decomposition import PCA
 
+logger = logging.getLogger(__name__)
+
+# Shot shapes and lies a Shot can be saved with
+VALID_SHOT_SHAPES = frozenset(value for value, _ in Shot.SHOT_SHAPE_CHOICES)
+VALID_LIES = frozenset(value for value, _ in Shot.LIE_CHOICES)
+
+# Default set of clubs given to every new user
+DEFAULT_CLUBS = ('Driver', '3 Wood', '5 Wood', '4 Iron', '5 Iron', '6 Iron', '7 Iron', '8 Iron', '9 Iron', 'Pitching Wedge', '52 Degree', '56 Degree', '60 Degree')
+
 # --- Authentication Views ---
 def signup_view(request):
     if request.method == 'POST':
         form = UserCreationForm(request.POST)
         if form.is_valid():
-            user = form.save()
-            login(request, user)
-            # Add a default set of clubs for a new user
-            default_clubs = ['Driver', '3 Wood', '5 Wood', '4 Iron', '5 Iron', '6 Iron', '7 Iron', '8 Iron', '9 Iron', 'Pitching Wedge', '52 Degree', '56 Degree', '60 Degree']
-            for club_name in default_clubs:
-                Club.objects.create(user=user, name=club_name)
+            # Create the user and their default bag together so a failure leaves neither behind
+            with transaction.atomic():
+                user = form.save()
+                login(request, user)
+                # Add a default set of clubs for a new user
+                Club.objects.bulk_create([Club(user=user, name=club_name) for club_name in DEFAULT_CLUBS])
             return redirect('dashboard')
     else:
         form = UserCreationForm()
@@ -49,7 +62,56 @@ def logout_view(request):
     logout(request)
     return redirect('login')
 
+# --- Cache Helpers ---
+CLUB_STATS_CACHE_TIMEOUT = 300  # seconds
+RECOMMENDATION_CACHE_TIMEOUT = 60  # seconds
+KNN_CACHE_TIMEOUT = 300  # seconds
+
+def _club_stats_cache_key(user):
+    return f'user:{user.id}:clubs_stats:{get_stats_version(user)}'
+
+def get_stats_version(user):
+    """
+    Returns a token that changes whenever the user's shot data changes: their shot count and
+    newest shot id, read from the database so every worker process sees a change once it is
+    committed. Cache keys that depend on shot data include it, so a change retires them all
+    at once. Worked out once per request and kept on the user object, so views redirect after
+    changing shots rather than reading the stats again in the same request.
+    
+    Editing a shot in place (e.g. in the admin) leaves the count and newest id unchanged, so
+    cached stats and the KNN model stay stale until their cache timeouts expire.
+    """
+    version = getattr(user, '_stats_version', None)
+    if version is None:
+        stats = Shot.objects.filter(club__user=user).aggregate(count=Count('id'), latest=Max('id'))
+        version = user._stats_version = f"{stats['count']}-{stats['latest']}"
+    return version
+
+def _recommendation_cache_key(user, distance, lie, bend, shot_shape):
+    params = hashlib.md5(repr((distance, lie, bend, shot_shape)).encode('utf-8')).hexdigest()
+    return f'user:{user.id}:recs:{get_stats_version(user)}:{params}'
+
+def _knn_cache_key(user):
+    return f'user:{user.id}:knn:{get_stats_version(user)}'
+
+def get_cached_club_stats(user):
+    """
+    Returns the user's clubs that have shots, annotated with their distance stats.
+    The bag changes far less often than it is queried, so the result is cached per user
+    until their shots change.
+    """
+    key = _club_stats_cache_key(user)
+    clubs = cache.get(key)
+    if clubs is None:
+        clubs = list(Club.objects.filter(user=user).with_distance_stats().filter(shot_count__gt=0))
+        cache.set(key, clubs, CLUB_STATS_CACHE_TIMEOUT)
+    return clubs
+
 # --- Main Application Views ---
+# First number in a club name, e.g. the 7 in "7 Iron" or the 50 in "50 Degree Wedge"
+_CLUB_NUMBER_RE = re.compile(r'\d+')
+
+@functools.lru_cache(maxsize=256)
 def get_club_sort_order(club_name):
     """
     Returns a numeric sort order for golf clubs from Driver to Gap Wedge.
@@ -75,17 +137,17 @@ def get_club_sort_order(club_name):
     # Hybrids
     if 'hybrid' in name_lower:
         # Extract number if present
-        numbers = re.findall(r'\d+', club_name)
-        if numbers:
-            num = int(numbers[0])
+        number = _CLUB_NUMBER_RE.search(club_name)
+        if number:
+            num = int(number.group())
             return 10 + (10 - num)  # Higher number = lower sort order
         return 20
     
     # Irons
     if 'iron' in name_lower:
-        numbers = re.findall(r'\d+', club_name)
-        if numbers:
-            num = int(numbers[0])
+        number = _CLUB_NUMBER_RE.search(club_name)
+        if number:
+            num = int(number.group())
             # 4 Iron = 10, 5 Iron = 11, ..., 9 Iron = 15
             return 10 + (num - 4) if 4 <= num <= 9 else 20 + num
         return 30
@@ -102,9 +164,9 @@ def get_club_sort_order(club_name):
             return 19
         else:
             # Other wedges - try to extract degree
-            numbers = re.findall(r'\d+', club_name)
-            if numbers:
-                degree = int(numbers[0])
+            number = _CLUB_NUMBER_RE.search(club_name)
+            if number:
+                degree = int(number.group())
                 if degree <= 52:
                     return 17
                 elif degree <= 56:
@@ -116,20 +178,24 @@ def get_club_sort_order(club_name):
     # Default: put unknown clubs at the end
     return 100
 
+RECENT_ROUNDS_LIMIT = 20
+
 @login_required
 def dashboard_view(request):
     """Displays user's clubs and their average performance."""
-    clubs = Club.objects.filter(user=request.user).annotate(
-        avg_fairway=Avg('shot__distance', filter=Q(shot__lie__in=['Fairway', 'Tee Box'])),
-        avg_rough=Avg('shot__distance', filter=Q(shot__lie='Rough')),
+    # All per-club stats come back in one grouped query; the template never
+    # iterates shots, so there is nothing to prefetch, and it only reads these
+    # columns, so plain rows are enough (no Club instances).
+    clubs = Club.objects.filter(user=request.user).with_distance_stats().annotate(
         std_dev=StdDev('shot__distance')
-    ).prefetch_related('shot_set')
+    ).values('name', 'avg_fairway', 'avg_rough', 'std_dev')
     
     # Sort clubs in standard golf order (Driver to Gap Wedge)
     clubs_list = list(clubs)
-    clubs_list.sort(key=lambda club: (get_club_sort_order(club.name), club.name))
+    clubs_list.sort(key=lambda club: (get_club_sort_order(club['name']), club['name']))
     
-    rounds = GolfRound.objects.filter(user=request.user).order_by('-date')
+    # Only the most recent rounds are listed, and only the columns the template shows
+    rounds = GolfRound.objects.filter(user=request.user).only('id', 'date', 'course_name').order_by('-date')[:RECENT_ROUNDS_LIMIT]
     return render(request, 'dashboard/dashboard.html', {'clubs': clubs_list, 'rounds': rounds})
 
 @login_required
@@ -137,7 +203,6 @@ def add_round_view(request):
     """Handles the creation of a new round and its associated shots."""
     if request.method == 'POST':
         course_name = request.POST.get('course_name')
-        new_round = GolfRound.objects.create(user=request.user, course_name=course_name)
 
         # Process multiple shots submitted with the form
         clubs_ids = request.POST.getlist('club[]')
@@ -145,15 +210,41 @@ def add_round_view(request):
         shot_shapes = request.POST.getlist('shot_shape[]')
         lies = request.POST.getlist('lie[]')
 
-        for i in range(len(clubs_ids)):
-            if distances[i]: # Only save if distance is entered
-                Shot.objects.create(
+        # Rows missing a club, shape or lie field can't be matched up and are reported as skipped
+        row_counts = [len(clubs_ids), len(distances), len(shot_shapes), len(lies)]
+        incomplete_count = max(row_counts) - min(row_counts)
+        invalid_count = 0
+        
+        # Create the round and all of its shots together so a failure doesn't leave an empty round
+        with transaction.atomic():
+            new_round = GolfRound.objects.create(user=request.user, course_name=course_name)
+            shots = []
+            for club_id, distance, shot_shape, lie in zip(clubs_ids, distances, shot_shapes, lies):
+                if not distance:  # Only save if distance is entered
+                    continue
+                try:
+                    distance = int(distance)
+                except ValueError:
+                    distance = None
+                if distance is None or distance < 0:
+                    # Skip rows with a malformed or negative distance rather than failing the whole round
+                    invalid_count += 1
+                    continue
+                shots.append(Shot(
                     golf_round=new_round,
-                    club_id=clubs_ids[i],
-                    distance=int(distances[i]),
-                    shot_shape=shot_shapes[i],
-                    lie=lies[i]
-                )
+                    club_id=club_id,
+                    distance=distance,
+                    shot_shape=shot_shape,
+                    lie=lie
+                ))
+            Shot.objects.bulk_create(shots, batch_size=500)
+        
+        if invalid_count or incomplete_count:
+            messages.warning(
+                request,
+                f"Saved {len(shots)} shots. {invalid_count} shots with an invalid or negative distance "
+                f"and {incomplete_count} incomplete shot rows were skipped."
+            )
         return redirect('round_detail', round_id=new_round.id)
 
     clubs = Club.objects.filter(user=request.user)
@@ -163,9 +254,147 @@ def add_round_view(request):
 def round_detail_view(request, round_id):
     """Displays the details and shots of a specific round."""
     golf_round = get_object_or_404(GolfRound, id=round_id, user=request.user)
-    shots = Shot.objects.filter(golf_round=golf_round).order_by('id')
+    shots = Shot.objects.filter(golf_round=golf_round).select_related('club').order_by('id')
     return render(request, 'dashboard/round_detail.html', {'round': golf_round, 'shots': shots})
 
+# Hole bend inferred from the shot shape used historically; anything else was a straight hole
+BEND_BY_SHOT_SHAPE = {
+    'Draw': 'Dogleg Left',  # Used draw/hook to go left
+    'Hook': 'Dogleg Left',
+    'Fade': 'Dogleg Right',  # Used fade/slice to go right
+    'Slice': 'Dogleg Right',
+}
+
+# Weights: distance=5.0, lie=10.0 (most important), bend=1.0, shot_shape=1.0
+def weighted_distances(X_train, x_query):
+    """
+    Custom weighted distance, heavily weighting lie and distance, from x_query to every
+    training shot at once. Rows are feature vectors: [distance, lie_encoded, bend_encoded, shot_shape_encoded]
+    """
+    # The cached model stores X_train as float32; widen it so the distances are float64 on any NumPy version
+    X_train = np.asarray(X_train, dtype=np.float64)
+    x_query = np.asarray(x_query, dtype=np.float64)
+    
+    # Extract components
+    dist_diff = np.abs(X_train[:, 0] - x_query[0])  # Distance difference
+    lie_diff = np.where(X_train[:, 1] == x_query[1], 0.0, 10.0)  # Lie mismatch gets heavy penalty
+    bend_diff = np.abs(X_train[:, 2] - x_query[2])  # Bend difference
+    shot_shape_diff = np.abs(X_train[:, 3] - x_query[3])  # Shot shape difference
+    
+    # Weighted distance: lie is most important, then distance
+    # Normalize distance by typical range (assume max 300 yards)
+    normalized_dist = (dist_diff / 300.0) * 5.0
+    normalized_bend = bend_diff * 1.0
+    normalized_shot_shape = shot_shape_diff * 1.0
+    
+    # Combine: lie mismatch is heavily penalized, distance is important
+    total_distance = lie_diff + normalized_dist + normalized_bend + normalized_shot_shape
+    return total_distance
+
+def nearest_neighbors(X_train, x_query, k):
+    """
+    Returns (distances, indices) of the k training shots nearest to x_query, closest first.
+    Ties keep training order.
+    """
+    distances = weighted_distances(X_train, x_query)
+    if k < len(distances):
+        # Find the k-th smallest distance in linear time and only sort the shots within it
+        kth_distance = np.partition(distances, k - 1)[k - 1]
+        candidates = np.flatnonzero(distances <= kth_distance)
+        indices = candidates[np.argsort(distances[candidates], kind='stable')][:k]
+    else:
+        indices = np.argsort(distances, kind='stable')
+    return distances[indices], indices
+
+def neighbor_vote(neighbor_dists, neighbor_labels, n_classes):
+    """
+    Inverse-distance weighted share of the vote for each class, like
+    KNeighborsClassifier(weights='distance').predict_proba: if any neighbor is an exact
+    match, only the exact matches vote.
+    """
+    with np.errstate(divide='ignore'):
+        weights = 1.0 / neighbor_dists
+    exact_matches = np.isinf(weights)
+    if exact_matches.any():
+        weights = exact_matches.astype(float)
+    votes = np.bincount(neighbor_labels, weights=weights, minlength=n_classes)
+    return votes / votes.sum()
+
+def category_codes(values):
+    """
+    Maps each distinct value to an integer code, in sorted order (the same codes
+    LabelEncoder assigns). Values missing from the data are encoded as 0 by callers.
+    """
+    return {value: code for code, value in enumerate(sorted(set(values)))}
+
+def get_cached_knn_model(user):
+    """
+    Returns the user's fitted KNN model with the category codes and labels it was trained on,
+    or None if they have fewer than 3 shots. Training only depends on the user's shots,
+    so it is cached until they change rather than refitted for every query; the
+    recommendation and visualization views share it.
+    """
+    key = _knn_cache_key(user)
+    model = cache.get(key)
+    if model is not None:
+        return model
+    
+    # Get all user's historical shots: only the columns the model uses, with the
+    # club name joined in the same query
+    shot_rows = list(
+        Shot.objects.filter(club__user=user).values_list('id', 'distance', 'lie', 'shot_shape', 'club__name')
+    )
+    
+    if len(shot_rows) < 3:
+        return None
+    
+    # Prepare training data: features (distance, lie, bend, shot_shape) and target (club)
+    lie_col = [row[2] for row in shot_rows]
+    shot_shape_col = [row[3] for row in shot_rows]
+    clubs_list = [row[4] for row in shot_rows]  # Target: which club was used
+    
+    # Encode lie, bend, and shot_shape
+    lie_codes = category_codes(lie_col)
+    shot_shape_codes = category_codes(shot_shape_col)
+    # Bend is inferred from shot_shape for historical shots, so it only needs working out
+    # once per distinct shape: bend_code_by_shape_code[shape code] is that shape's bend code
+    shape_bends = [BEND_BY_SHOT_SHAPE.get(shape, 'Straight') for shape in shot_shape_codes]
+    bend_codes = category_codes(shape_bends)
+    bend_code_by_shape_code = np.array([bend_codes[bend] for bend in shape_bends])
+    shot_shape_encoded = np.array([shot_shape_codes[value] for value in shot_shape_col])
+    
+    # Combine all features: distance (numeric) + encoded lie + encoded bend + encoded shot_shape.
+    # Yardages and codes are small integers, which float32 holds exactly in half the space;
+    # weighted_distances() widens them to float64 before computing distances
+    X_train = np.empty((len(shot_rows), 4), dtype=np.float32)
+    X_train[:, 0] = [row[1] for row in shot_rows]
+    X_train[:, 1] = [lie_codes[value] for value in lie_col]
+    X_train[:, 2] = bend_code_by_shape_code[shot_shape_encoded]
+    X_train[:, 3] = shot_shape_encoded
+    
+    # Encode club names (target variable)
+    club_codes = category_codes(clubs_list)
+    y_train = np.array([club_codes[club] for club in clubs_list])
+    
+    # Determine optimal k (number of neighbors)
+    # Use sqrt of sample size, but at least 3 and at most 10
+    k = max(3, min(10, int(np.sqrt(len(X_train)))))
+    
+    model = {
+        'X_train': X_train,
+        'y_train': y_train,
+        'k': k,
+        'n_shots': len(X_train),
+        'clubs_list': clubs_list,
+        'shot_ids': [row[0] for row in shot_rows],
+        'lie_codes': lie_codes,
+        'bend_codes': bend_codes,
+        'shot_shape_codes': shot_shape_codes,
+        'club_classes': list(club_codes),  # Club name for each code, in code order
+    }
+    cache.set(key, model, KNN_CACHE_TIMEOUT)
+    return model
+
 @login_required
 def recommendation_view(request):
     context = {}
@@ -181,144 +410,52 @@ def recommendation_view(request):
             context['bend_input'] = bend
             context['shot_shape_input'] = shot_shape
 
-            # Get all user's historical shots
-            user_shots = Shot.objects.filter(club__user=request.user)
-            
-            if user_shots.count() < 3:
-                context['error'] = "Not enough shot data. You need at least 3 shots to get recommendations."
+            # Golfers often repeat the same query during a round; reuse the result until their shots change
+            recommendation_cache_key = _recommendation_cache_key(request.user, distance_to_hole, lie, bend, shot_shape)
+            cached_result = cache.get(recommendation_cache_key)
+            if cached_result is not None:
+                context.update(cached_result)
                 return render(request, 'dashboard/recommendations.html', context)
 
-            # Helper function to infer bend from shot_shape for historical data
-            def infer_bend_from_shot_shape(shot_shape):
-                """Infer hole bend from shot shape used historically."""
-                if shot_shape in ['Draw', 'Hook']:
-                    return 'Dogleg Left'  # Used draw/hook to go left
-                elif shot_shape in ['Fade', 'Slice']:
-                    return 'Dogleg Right'  # Used fade/slice to go right
-                else:
-                    return 'Straight'  # Straight shot, no bend needed
-
-            # Prepare training data: features (distance, lie, bend, shot_shape) and target (club)
-            features_list = []
-            clubs_list = []
+            # Fitted model for the user's shots (refitted only when their shots change)
+            model = get_cached_knn_model(request.user)
             
-            for shot in user_shots:
-                # Infer bend from shot_shape for historical shots
-                inferred_bend = infer_bend_from_shot_shape(shot.shot_shape)
-                
-                features_list.append([
-                    shot.distance,      # Feature 1: Distance (numeric)
-                    shot.lie,           # Feature 2: Lie (categorical)
-                    inferred_bend,      # Feature 3: Bend (inferred from shot_shape) (categorical)
-                    shot.shot_shape     # Feature 4: Shot Shape (categorical)
-                    # Add more features here in the future
-                ])
-                clubs_list.append(shot.club.name)  # Target: which club was used
-            
-            if not features_list:
-                context['error'] = "No shot data available for recommendations."
+            if model is None:
+                context['error'] = "Not enough shot data. You need at least 3 shots to get recommendations."
                 return render(request, 'dashboard/recommendations.html', context)
-
-            # Encode categorical features
-            # Extract numeric and categorical columns
-            features_array = np.array(features_list)
-            distance_col = features_array[:, 0].astype(float).reshape(-1, 1)
-            lie_col = features_array[:, 1]
-            bend_col = features_array[:, 2]
-            shot_shape_col = features_array[:, 3]
-            
-            # Encode lie, bend, and shot_shape
-            lie_encoder = LabelEncoder()
-            bend_encoder = LabelEncoder()
-            shot_shape_encoder = LabelEncoder()
-            
-            lie_encoded = lie_encoder.fit_transform(lie_col).reshape(-1, 1)
-            bend_encoded = bend_encoder.fit_transform(bend_col).reshape(-1, 1)
-            shot_shape_encoded = shot_shape_encoder.fit_transform(shot_shape_col).reshape(-1, 1)
             
-            # Combine all features: distance (numeric) + encoded lie + encoded bend + encoded shot_shape
-            X_train = np.hstack([distance_col, lie_encoded, bend_encoded, shot_shape_encoded])
-            
-            # Encode club names (target variable)
-            club_encoder = LabelEncoder()
-            y_train = club_encoder.fit_transform(clubs_list)
+            X_train = model['X_train']
+            y_train = model['y_train']
+            k = model['k']
+            clubs_list = model['clubs_list']
+            lie_codes = model['lie_codes']
+            bend_codes = model['bend_codes']
+            shot_shape_codes = model['shot_shape_codes']
+            club_classes = model['club_classes']
             
             # Prepare query point (current situation)
-            try:
-                lie_encoded_query = lie_encoder.transform([lie])[0]
-            except ValueError:
-                # If lie not in training data, use most common lie
-                lie_encoded_query = lie_encoder.transform([lie_encoder.classes_[0]])[0]
-            
-            try:
-                bend_encoded_query = bend_encoder.transform([bend])[0]
-            except ValueError:
-                # If bend not in training data, use most common bend
-                bend_encoded_query = bend_encoder.transform([bend_encoder.classes_[0]])[0]
-            
-            try:
-                shot_shape_encoded_query = shot_shape_encoder.transform([shot_shape])[0]
-            except ValueError:
-                # If shot_shape not in training data, use most common shot_shape
-                shot_shape_encoded_query = shot_shape_encoder.transform([shot_shape_encoder.classes_[0]])[0]
-            
-            X_query = np.array([[distance_to_hole, lie_encoded_query, bend_encoded_query, shot_shape_encoded_query]])
-            
-            # Weights: distance=5.0, lie=10.0 (most important), bend=1.0, shot_shape=1.0
-            def weighted_distance(x, y):
-                """
-                Custom weighted distance metric that heavily weights lie and distance.
-                x, y are feature vectors: [distance, lie_encoded, bend_encoded, shot_shape_encoded]
-                """
-                # Extract components
-                dist_diff = abs(x[0] - y[0])  # Distance difference
-                lie_diff = 0 if x[1] == y[1] else 10.0  # Lie mismatch gets heavy penalty
-                bend_diff = abs(x[2] - y[2])  # Bend difference
-                shot_shape_diff = abs(x[3] - y[3])  # Shot shape difference
-                
-                # Weighted distance: lie is most important, then distance
-                # Normalize distance by typical range (assume max 300 yards)
-                normalized_dist = (dist_diff / 300.0) * 5.0
-                normalized_bend = bend_diff * 1.0
-                normalized_shot_shape = shot_shape_diff * 1.0
-                
-                # Combine: lie mismatch is heavily penalized, distance is important
-                total_distance = lie_diff + normalized_dist + normalized_bend + normalized_shot_shape
-                return total_distance
-            
-            # Determine optimal k (number of neighbors)
-            # Use sqrt of sample size, but at least 3 and at most 10
-            k = max(3, min(10, int(np.sqrt(len(X_train)))))
-            
-            # Train KNN classifier with custom weighted distance metric
-            knn = KNeighborsClassifier(n_neighbors=k, weights='distance', metric=weighted_distance)
-            knn.fit(X_train, y_train)
-            
-            # Get predictions and distances to neighbors
-            neighbor_distances, neighbor_indices = knn.kneighbors(X_query, n_neighbors=min(k, len(X_train)))
+            # A lie, bend or shot_shape not in the training data uses the first one's code
+            lie_encoded_query = lie_codes.get(lie, 0)
+            bend_encoded_query = bend_codes.get(bend, 0)
+            shot_shape_encoded_query = shot_shape_codes.get(shot_shape, 0)
+
+            X_query = np.array([distance_to_hole, lie_encoded_query, bend_encoded_query, shot_shape_encoded_query], dtype=float)
             
-            # Get the predicted club
-            predicted_club_encoded = knn.predict(X_query)[0]
-            predicted_club = club_encoder.inverse_transform([predicted_club_encoded])[0]
+            # Get distances to neighbors, and each club's distance-weighted share of their vote
+            neighbor_dists, neighbor_indices = nearest_neighbors(X_train, X_query, k)
+            all_club_probs = neighbor_vote(neighbor_dists, y_train[neighbor_indices], len(club_classes))
             
             # Calculate better confidence scores based on distance-weighted agreement
-            # Get actual club names of neighbors
-            neighbor_clubs = [clubs_list[i] for i in neighbor_indices[0]]
-            neighbor_dists = neighbor_distances[0]
+            # Get the club code of each neighbor
+            neighbor_labels = y_train[neighbor_indices]
             
             # Calculate weighted scores for each club based on inverse distance
             # Closer neighbors have more weight
-            club_scores = {}
-            total_weight = 0
-            
-            for i, club in enumerate(neighbor_clubs):
-                # Use inverse distance as weight (add small epsilon to avoid division by zero)
-                weight = 1.0 / (neighbor_dists[i] + 0.0001)
-                total_weight += weight
-                
-                if club not in club_scores:
-                    club_scores[club] = 0
-                club_scores[club] += weight
+            # Use inverse distance as weight (add small epsilon to avoid division by zero)
+            neighbor_weights = 1.0 / (neighbor_dists + 0.0001)
+            total_weight = neighbor_weights.sum()
+            club_scores = np.bincount(neighbor_labels, weights=neighbor_weights, minlength=len(club_classes))
+            neighbor_club_counts = np.bincount(neighbor_labels, minlength=len(club_classes))
             
             # Normalize scores to probabilities (0-1 range)
             # But also factor in the average distance to neighbors for overall confidence
@@ -332,68 +469,45 @@ def recommendation_view(request):
             else:
                 distance_confidence = 1.0
             
-            # Normalize club scores to probabilities
-            club_probabilities = {}
-            if club_scores and total_weight > 0:
-                for club, score in club_scores.items():
-                    # Raw probability from distance-weighted scores
-                    raw_prob = score / total_weight
-                    # Apply confidence factor - if neighbors are far, reduce confidence
-                    # Scale between 0.6-1.0 based on distance confidence
-                    adjusted_prob = raw_prob * (0.6 + 0.4 * distance_confidence)
-                    # Ensure valid probability range
-                    club_probabilities[club] = max(0.0, min(1.0, float(adjusted_prob)))
+            # Normalize club scores to probabilities (for every club code at once)
+            # Raw probability from distance-weighted scores
+            raw_probs = club_scores / total_weight
+            # Apply confidence factor - if neighbors are far, reduce confidence
+            # Scale between 0.6-1.0 based on distance confidence, keeping a valid probability range
+            club_probabilities = np.clip(raw_probs * (0.6 + 0.4 * distance_confidence), 0.0, 1.0)
             
-            # Get probabilities for all clubs from KNN
-            all_club_probs = knn.predict_proba(X_query)[0]
-            all_club_probabilities = {
-                club_encoder.inverse_transform([i])[0]: float(prob) 
-                for i, prob in enumerate(all_club_probs)
-            }
-            
-            # Merge - prioritize distance-weighted scores for neighbors, use KNN prob for others
-            final_probabilities = {}
-            for club in all_club_probabilities:
-                if club in club_probabilities:
-                    # Use distance-weighted probability (from neighbors)
-                    final_probabilities[club] = club_probabilities[club]
-                else:
-                    # Use KNN probability but scale it down since it's not in neighbors
-                    final_probabilities[club] = all_club_probabilities[club] * 0.5
+            # Merge - prioritize distance-weighted scores for neighbors' clubs, use KNN prob
+            # (scaled down since the club is not in the neighbors) for others
+            final_probs = np.where(neighbor_club_counts > 0, club_probabilities, all_club_probs * 0.5)
             
             # Get nearest neighbors details for recommendations
             recommendations = []
             seen_clubs = set()
             
-            # Sort clubs by probability (highest first)
-            sorted_clubs = sorted(final_probabilities.items(), key=lambda x: x[1], reverse=True)
-            
-            # Get club objects for easier access to model methods
-            club_objects = {club.name: club for club in Club.objects.filter(user=request.user)}
+            # Get club objects with their distance averages (clubs with shots only, cached per user)
+            club_objects = {club.name: club for club in get_cached_club_stats(request.user)}
             
             # Calculate a combined score: probability * agreement * distance_weight
             # This helps prioritize clubs that are both likely AND have strong neighbor agreement
+            # Ensure probability is valid
+            probs = np.where(np.isnan(final_probs) | (final_probs < 0), 0.0, final_probs)
+            agreements = neighbor_club_counts / len(neighbor_labels)
+            
+            # Combined score: probability weighted by agreement and distance confidence
+            # Agreement boost: clubs with more neighbor agreement get higher scores
+            agreement_boosts = 0.3 + 0.7 * agreements  # Scale from 0.3 to 1.0
+            combined_scores = probs * agreement_boosts * distance_confidence
+            
+            # Ensure combined score is valid
+            combined_scores = np.where(np.isnan(combined_scores) | (combined_scores < 0), 0.0, combined_scores)
+            
+            # Clubs by probability (highest first)
             club_scores_combined = {}
-            for club_name, prob in sorted_clubs:
-                # Ensure probability is valid
-                if np.isnan(prob) or prob < 0:
-                    prob = 0.0
-                
-                agreement = sum(1 for c in neighbor_clubs if c == club_name) / len(neighbor_clubs) if neighbor_clubs else 0
-                
-                # Combined score: probability weighted by agreement and distance confidence
-                # Agreement boost: clubs with more neighbor agreement get higher scores
-                agreement_boost = 0.3 + 0.7 * agreement  # Scale from 0.3 to 1.0
-                combined_score = prob * agreement_boost * distance_confidence
-                
-                # Ensure combined score is valid
-                if np.isnan(combined_score) or combined_score < 0:
-                    combined_score = 0.0
-                
-                club_scores_combined[club_name] = {
-                    'probability': float(prob),
-                    'agreement': float(agreement),
-                    'combined_score': float(combined_score)
+            for code in np.argsort(-final_probs, kind='stable').tolist():
+                club_scores_combined[club_classes[code]] = {
+                    'probability': float(probs[code]),
+                    'agreement': float(agreements[code]),
+                    'combined_score': float(combined_scores[code])
                 }
             
             # Re-sort by combined score
@@ -420,13 +534,7 @@ def recommendation_view(request):
                     continue
                 
                 # Calculate average distance based on the selected lie
-                if lie in ['Fairway', 'Tee Box']:
-                    avg_distance = club_obj.get_average_distance_fairway()
-                elif lie == 'Rough':
-                    avg_distance = club_obj.get_average_distance_rough()
-                else:
-                    # Fallback: use general average if lie is something else
-                    avg_distance = club_obj.get_average_distance()
+                avg_distance = club_obj.get_average_distance_for_lie(lie)
                 
                 # Only include clubs that have data for this lie
                 if avg_distance is not None and avg_distance > 0:
@@ -468,23 +576,16 @@ def recommendation_view(request):
             
             # Fallback: recommend furthest club in bag if KNN has no good neighbors
             if use_fallback:
-                # Get all clubs for the user
-                all_user_clubs = Club.objects.filter(user=request.user)
+                # Reuse the user's clubs (with shots) already loaded above rather than querying again
                 fallback_clubs = []
                 
-                for club in all_user_clubs:
+                for club in club_objects.values():
                     # Never recommend Driver if lie is not Tee Box
                     if club.name.lower() == 'driver' and lie != 'Tee Box':
                         continue
                     
                     # Calculate average distance based on the selected lie
-                    if lie in ['Fairway', 'Tee Box']:
-                        avg_distance = club.get_average_distance_fairway()
-                    elif lie == 'Rough':
-                        avg_distance = club.get_average_distance_rough()
-                    else:
-                        # Fallback: use general average if lie is something else
-                        avg_distance = club.get_average_distance()
+                    avg_distance = club.get_average_distance_for_lie(lie)
                     
                     # Only include clubs that have data for this lie
                     if avg_distance is not None and avg_distance > 0:
@@ -497,7 +598,7 @@ def recommendation_view(request):
                             'club_obj': club
                         })
                 
-                # Sort by distance difference (closest to target first)
+                # Closest average distance to the target first
                 fallback_clubs.sort(key=lambda x: x['distance_diff'])
                 
                 # Add the closest matching club(s) as recommendations
@@ -520,6 +621,11 @@ def recommendation_view(request):
                 # Add top recommendations (only 1-2, or 3 if scores are very close)
                 max_recommendations = 2
                 min_score_threshold = top_score * 0.4  # Must be at least 40% of top score
+                high_score_threshold = top_score * 0.75
+                medium_score_threshold = top_score * 0.5
+                
+                # Neighbors count as close when their average distance is below the median neighbor distance
+                neighbors_close = len(neighbor_dists) > 0 and avg_neighbor_distance < np.percentile(neighbor_dists, 50)
                 
                 for club_data in club_distance_rankings:
                     club_name = club_data['club_name']
@@ -542,9 +648,9 @@ def recommendation_view(request):
                         avg_distance = int(round(avg_distance))
                         
                         # Determine confidence based on combined score and neighbor distance
-                        if combined_score > top_score * 0.75 and avg_neighbor_distance < np.percentile(neighbor_dists, 50) if len(neighbor_dists) > 0 else False:
+                        if combined_score > high_score_threshold and neighbors_close:
                             confidence = 'High'
-                        elif combined_score > top_score * 0.5:
+                        elif combined_score > medium_score_threshold:
                             confidence = 'Medium'
                         else:
                             confidence = 'Low'
@@ -579,15 +685,18 @@ def recommendation_view(request):
             
             context['recommendations'] = recommendations
             context['k_value'] = k
-            context['total_shots_analyzed'] = len(X_train)
+            context['total_shots_analyzed'] = model['n_shots']
+            cache.set(recommendation_cache_key, {
+                'recommendations': recommendations,
+                'k_value': k,
+                'total_shots_analyzed': model['n_shots']
+            }, RECOMMENDATION_CACHE_TIMEOUT)
             
         except ValueError as e:
             context['error'] = f"Invalid input: {str(e)}"
         except Exception as e:
             context['error'] = f"Error generating recommendations: {str(e)}"
-            # For debugging - remove in production
-            import traceback
-            print(f"KNN Error: {traceback.format_exc()}")
+            logger.exception("KNN Error")
 
     return render(request, 'dashboard/recommendations.html', context)
 
@@ -604,94 +713,28 @@ def recommendation_visualization_view(request):
         bend = request.GET.get('bend', 'Straight')
         shot_shape = request.GET.get('shot_shape', 'Straight')
         
-        # Get all user's historical shots
-        user_shots = Shot.objects.filter(club__user=request.user)
+        # Same training data as recommendation_view (rebuilt only when the user's shots change)
+        model = get_cached_knn_model(request.user)
         
-        if user_shots.count() < 3:
+        if model is None:
             return JsonResponse({'error': 'Not enough shot data for visualization'}, status=400)
         
-        # Helper function to infer bend from shot_shape (same as recommendation_view)
-        def infer_bend_from_shot_shape(shot_shape):
-            if shot_shape in ['Draw', 'Hook']:
-                return 'Dogleg Left'
-            elif shot_shape in ['Fade', 'Slice']:
-                return 'Dogleg Right'
-            else:
-                return 'Straight'
-        
-        # Prepare training data (same as recommendation_view)
-        features_list = []
-        clubs_list = []
-        shot_ids = []
+        X_train = model['X_train'].astype(float)
+        clubs_list = model['clubs_list']
+        shot_ids = model['shot_ids']
         
-        for shot in user_shots:
-            inferred_bend = infer_bend_from_shot_shape(shot.shot_shape)
-            features_list.append([
-                shot.distance,
-                shot.lie,
-                inferred_bend,
-                shot.shot_shape
-            ])
-            clubs_list.append(shot.club.name)
-            shot_ids.append(shot.id)
-        
-        # Encode categorical features
-        features_array = np.array(features_list)
-        distance_col = features_array[:, 0].astype(float).reshape(-1, 1)
-        lie_col = features_array[:, 1]
-        bend_col = features_array[:, 2]
-        shot_shape_col = features_array[:, 3]
-        
-        lie_encoder = LabelEncoder()
-        bend_encoder = LabelEncoder()
-        shot_shape_encoder = LabelEncoder()
-        
-        lie_encoded = lie_encoder.fit_transform(lie_col).reshape(-1, 1)
-        bend_encoded = bend_encoder.fit_transform(bend_col).reshape(-1, 1)
-        shot_shape_encoded = shot_shape_encoder.fit_transform(shot_shape_col).reshape(-1, 1)
-        
-        X_train = np.hstack([distance_col, lie_encoded, bend_encoded, shot_shape_encoded])
+        # Names for each category code, in code order, to label the plotted shots
+        lie_names = list(model['lie_codes'])
+        bend_names = list(model['bend_codes'])
+        shot_shape_names = list(model['shot_shape_codes'])
         
         # Prepare query point
-        try:
-            lie_encoded_query = lie_encoder.transform([lie])[0]
-        except ValueError:
-            lie_encoded_query = lie_encoder.transform([lie_encoder.classes_[0]])[0]
-        
-        try:
-            bend_encoded_query = bend_encoder.transform([bend])[0]
-        except ValueError:
-            bend_encoded_query = bend_encoder.transform([bend_encoder.classes_[0]])[0]
-        
-        try:
-            shot_shape_encoded_query = shot_shape_encoder.transform([shot_shape])[0]
-        except ValueError:
-            shot_shape_encoded_query = shot_shape_encoder.transform([shot_shape_encoder.classes_[0]])[0]
-        
+        lie_encoded_query = model['lie_codes'].get(lie, 0)
+        bend_encoded_query = model['bend_codes'].get(bend, 0)
+        shot_shape_encoded_query = model['shot_shape_codes'].get(shot_shape, 0)
+
         X_query = np.array([[distance_to_hole, lie_encoded_query, bend_encoded_query, shot_shape_encoded_query]])
-        
-        # Create weighted distance metric function (same as recommendation_view)
-        def weighted_distance(x, y):
-            """
-            Custom weighted distance metric that heavily weights lie and distance.
-            x, y are feature vectors: [distance, lie_encoded, bend_encoded, shot_shape_encoded]
-            """
-            # Extract components
-            dist_diff = abs(x[0] - y[0])  # Distance difference
-            lie_diff = 0 if x[1] == y[1] else 10.0  # Lie mismatch gets heavy penalty
-            bend_diff = abs(x[2] - y[2])  # Bend difference
-            shot_shape_diff = abs(x[3] - y[3])  # Shot shape difference
-            
-            # Weighted distance: lie is most important, then distance
-            # Normalize distance by typical range (assume max 300 yards)
-            normalized_dist = (dist_diff / 300.0) * 5.0
-            normalized_bend = bend_diff * 1.0
-            normalized_shot_shape = shot_shape_diff * 1.0
-            
-            # Combine: lie mismatch is heavily penalized, distance is important
-            total_distance = lie_diff + normalized_dist + normalized_bend + normalized_shot_shape
-            return total_distance
-        
+
         # Use PCA to reduce dimensions to 2D for visualization
         # Combine training and query data for PCA
         X_combined = np.vstack([X_train, X_query])
@@ -702,39 +745,35 @@ def recommendation_visualization_view(request):
         X_train_2d = X_2d[:-1]
         X_query_2d = X_2d[-1:]
         
-        # Find k nearest neighbors for visualization
-        k = max(3, min(10, int(np.sqrt(len(X_train)))))
-        knn = KNeighborsClassifier(n_neighbors=k, weights='distance', metric=weighted_distance)
-        knn.fit(X_train, clubs_list)
-        
-        distances, indices = knn.kneighbors(X_query, n_neighbors=min(k, len(X_train)))
+        # Find k nearest neighbors for visualization (same weighted distance as recommendation_view)
+        k = model['k']
+        distances, indices = nearest_neighbors(X_train, X_query[0], k)
         
         # Get nearest neighbor indices
-        nearest_neighbor_indices = indices[0].tolist()
+        nearest_neighbor_indices = set(indices.tolist())
         
         # Prepare data for visualization
-        # Group shots by club for color coding
-        unique_clubs = list(set(clubs_list))
-        club_colors = {}
+        # Group shots by club for color coding: the model's club classes are the distinct
+        # clubs in sorted order, so each club keeps its color from one request to the next
         colors = ['#004029', '#8B4513', '#6B4423', '#D2B48C', '#006647', '#D4AF37', '#006400', '#004d00', '#f5f5dc', '#f4e4bc']
-        for i, club in enumerate(unique_clubs):
-            club_colors[club] = colors[i % len(colors)]
+        club_colors = {club: colors[i % len(colors)] for i, club in enumerate(model['club_classes'])}
         
-        # Prepare scatter plot data
-        shots_data = []
-        for i, (x, y) in enumerate(X_train_2d):
-            is_neighbor = i in nearest_neighbor_indices
-            shots_data.append({
-                'x': float(x),
-                'y': float(y),
-                'club': clubs_list[i],
-                'distance': int(features_list[i][0]),
-                'lie': features_list[i][1],
-                'bend': features_list[i][2],
-                'shot_shape': features_list[i][3],
-                'is_neighbor': is_neighbor,
-                'shot_id': shot_ids[i]
-            })
+        # Prepare scatter plot data (arrays converted to Python values in bulk)
+        shots_data = [
+            {
+                'x': x,
+                'y': y,
+                'club': club,
+                'distance': distance,
+                'lie': lie_names[lie_code],
+                'bend': bend_names[bend_code],
+                'shot_shape': shot_shape_names[shot_shape_code],
+                'is_neighbor': i in nearest_neighbor_indices,
+                'shot_id': shot_id
+            }
+            for i, ((x, y), (distance, lie_code, bend_code, shot_shape_code), club, shot_id)
+            in enumerate(zip(X_train_2d.tolist(), X_train.astype(int).tolist(), clubs_list, shot_ids))
+        ]
         
         # Query point data
         query_data = {
@@ -747,7 +786,8 @@ def recommendation_visualization_view(request):
         }
         
         # Get predicted club
-        predicted_club = knn.predict(X_query)[0]
+        club_classes = model['club_classes']
+        predicted_club = club_classes[np.argmax(neighbor_vote(distances, model['y_train'][indices], len(club_classes)))]
         
         return JsonResponse({
             'shots': shots_data,
@@ -759,7 +799,6 @@ def recommendation_visualization_view(request):
         })
         
     except Exception as e:
-        import traceback
         return JsonResponse({
             'error': str(e),
             'traceback': traceback.format_exc()
@@ -772,12 +811,12 @@ def clear_all_data_view(request):
     Keeps clubs since those are equipment.
     """
     if request.method == 'POST':
-        # Get all rounds for the user (this will cascade delete all shots)
-        rounds_count = GolfRound.objects.filter(user=request.user).count()
-        shots_count = Shot.objects.filter(club__user=request.user).count()
-        
-        # Delete all rounds (shots will be cascade deleted)
-        GolfRound.objects.filter(user=request.user).delete()
+        # Delete all rounds (shots will be cascade deleted); delete() reports how many of each went.
+        # One transaction covers finding the shots to cascade to and deleting them
+        with transaction.atomic():
+            _, deleted_counts = GolfRound.objects.filter(user=request.user).delete()
+        rounds_count = deleted_counts.get(GolfRound._meta.label, 0)
+        shots_count = deleted_counts.get(Shot._meta.label, 0)
         
         messages.success(
             request,
@@ -786,14 +825,13 @@ def clear_all_data_view(request):
         )
         return redirect('dashboard')
     
-    # If GET request, show confirmation page
-    rounds_count = GolfRound.objects.filter(user=request.user).count()
-    shots_count = Shot.objects.filter(club__user=request.user).count()
+    # If GET request, show confirmation page with both counts from one query
+    counts = GolfRound.objects.filter(user=request.user).aggregate(
+        rounds_count=Count('id', distinct=True),
+        shots_count=Count('shot')
+    )
     
-    return render(request, 'dashboard/clear_data_confirm.html', {
-        'rounds_count': rounds_count,
-        'shots_count': shots_count
-    })
+    return render(request, 'dashboard/clear_data_confirm.html', counts)
 
 @login_required
 def load_test_data_view(request):
@@ -816,86 +854,106 @@ def load_test_data_view(request):
         messages.error(request, "You need to have clubs in your bag first. Please sign up.")
         return redirect('dashboard')
 
-    # 4. Create a new round for this test data
-    new_round = GolfRound.objects.create(
-        user=request.user, 
-        course_name="Test Data Load"
-    )
-
-    # 5. Get the user's clubs into a dictionary for fast lookup
+    # 4. Get the user's clubs into a dictionary for fast lookup
     # This turns [Club(name='Driver'), Club(name='7 Iron')]
     # into {'Driver': ClubObject, '7 Iron': ClubObject}
     user_clubs_dict = {club.name: club for club in user_clubs}
     
+    # Shots are saved in batches as the file is read, so memory stays flat for large files
     shots_to_create = []
+    loaded_count = 0
     skipped_count = 0
 
-    # 6. Read the CSV file
+    # 5. Create the round and its shots in one transaction, so a read error
+    # or an empty file leaves no round behind
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                club_name = row.get('club_name', '').strip()
+        with transaction.atomic():
+            new_round = GolfRound.objects.create(
+                user=request.user, 
+                course_name="Test Data Load"
+            )
+
+            # 6. Read the CSV file, finding each column's position once from the header
+            with open(file_path, 'r', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                columns = {name: index for index, name in enumerate(header)}
+                club_index = columns.get('club_name')
+                distance_index = columns.get('distance')
+                shot_shape_index = columns.get('shot_shape')
+                lie_index = columns.get('lie')
                 
-                # Find the user's *actual* club object that matches the name
-                club = user_clubs_dict.get(club_name)
- 
-                # 7. Only create a shot if the user has that club and distance is valid
-                if club and row.get('distance'):
-                    try:
-                        distance = int(row.get('distance'))
-                        shot_shape = row.get('shot_shape', 'Straight').strip()
-                        lie = row.get('lie', 'Fairway').strip()
-                        
-                        # Validate shot_shape and lie match the model choices
-                        valid_shapes = ['Straight', 'Fade', 'Draw', 'Slice', 'Hook']
-                        valid_lies = ['Fairway', 'Rough', 'Sand', 'Tee Box']
-                        
-                        if shot_shape not in valid_shapes:
-                            shot_shape = 'Straight'
-                        if lie not in valid_lies:
-                            lie = 'Fairway'
-                        
-                        shots_to_create.append(
-                            Shot(
-                                golf_round=new_round,
-                                club=club,
-                                distance=distance,
-                                shot_shape=shot_shape,
-                                lie=lie
+                for row in reader:
+                    if len(row) < len(header):
+                        # Skip blank lines, and count truncated rows as skipped
+                        if row:
+                            skipped_count += 1
+                        continue
+                    
+                    club_name = row[club_index].strip() if club_index is not None else ''
+                    distance = row[distance_index] if distance_index is not None else ''
+                    
+                    # Find the user's *actual* club object that matches the name
+                    club = user_clubs_dict.get(club_name)
+                    
+                    # 7. Only create a shot if the user has that club and distance is valid
+                    if club and distance:
+                        try:
+                            distance = int(distance)
+                            shot_shape = row[shot_shape_index].strip() if shot_shape_index is not None else 'Straight'
+                            lie = row[lie_index].strip() if lie_index is not None else 'Fairway'
+                            
+                            # Validate shot_shape and lie match the model choices
+                            if shot_shape not in VALID_SHOT_SHAPES:
+                                shot_shape = 'Straight'
+                            if lie not in VALID_LIES:
+                                lie = 'Fairway'
+                            
+                            shots_to_create.append(
+                                Shot(
+                                    golf_round=new_round,
+                                    club=club,
+                                    distance=distance,
+                                    shot_shape=shot_shape,
+                                    lie=lie
+                                )
                             )
-                        )
-                    except (ValueError, TypeError):
-                        # Skip row if distance isn't a valid number
+                            if len(shots_to_create) >= 1000:
+                                Shot.objects.bulk_create(shots_to_create)
+                                loaded_count += len(shots_to_create)
+                                shots_to_create.clear()
+                        except (ValueError, TypeError):
+                            # Skip row if distance isn't a valid number
+                            skipped_count += 1
+                    else:
                         skipped_count += 1
-                else:
-                    skipped_count += 1
 
-        # 8. Use bulk_create to add all shots to the DB in one query
-        if shots_to_create:
-            Shot.objects.bulk_create(shots_to_create)
-            messages.success(
-                request, 
-                f"Successfully loaded {len(shots_to_create)} shots from test data! "
-                f"({skipped_count} rows skipped due to missing clubs or invalid data)"
-            )
-            # 9. Redirect to the new round's detail page
-            return redirect('round_detail', round_id=new_round.id)
-        else:
-            messages.warning(
-                request, 
-                "No shots were loaded. Make sure your clubs match the club names in the CSV file."
-            )
-            # Delete the empty round
-            new_round.delete()
-            return redirect('dashboard')
+            # 8. Use bulk_create to add the last batch of shots to the DB
+            if shots_to_create:
+                Shot.objects.bulk_create(shots_to_create)
+                loaded_count += len(shots_to_create)
+            if not loaded_count:
+                # Nothing loaded - roll back the empty round
+                transaction.set_rollback(True)
         
     except Exception as e:
-        # Handle file read errors
+        # Handle file read errors (the round is rolled back with the transaction)
         messages.error(request, f"Error reading CSV file: {str(e)}")
-        # Delete the round if it was created
-        if new_round.id:
-            new_round.delete()
+        return redirect('dashboard')
+
+    if loaded_count:
+        messages.success(
+            request, 
+            f"Successfully loaded {loaded_count} shots from test data! "
+            f"({skipped_count} rows skipped due to missing clubs or invalid data)"
+        )
+        # 9. Redirect to the new round's detail page
+        return redirect('round_detail', round_id=new_round.id)
+    else:
+        messages.warning(
+            request, 
+            "No shots were loaded. Make sure your clubs match the club names in the CSV file."
+        )
         return redirect('dashboard')
 
 @login_required
@@ -921,12 +979,9 @@ def import_launch_monitor_view(request):
             messages.error(request, "Invalid file type. Please upload a CSV or JSON file")
             return redirect('import_launch_monitor')
         
-        # Read file content
+        # Read file content (the parser works on the decoded text for both CSV and JSON)
         try:
-            if file_ext == '.json':
-                file_content = uploaded_file.read().decode('utf-8')
-            else:
-                file_content = uploaded_file.read().decode('utf-8')
+            file_content = uploaded_file.read().decode('utf-8')
         except UnicodeDecodeError:
             messages.error(request, "File encoding error. Please ensure file is UTF-8 encoded")
             return redirect('import_launch_monitor')
@@ -955,13 +1010,10 @@ def import_launch_monitor_view(request):
             import_record.save()
             
             # Check for duplicate rounds
+            existing_rounds = find_existing_rounds(request.user, parsed_data.get('rounds', []))
             duplicate_rounds = []
             for round_data in parsed_data.get('rounds', []):
-                existing = GolfRound.objects.filter(
-                    user=request.user,
-                    date=round_data['date'],
-                    course_name=round_data['courseName']
-                ).first()
+                existing = existing_rounds.get((round_data['date'], round_data['courseName']))
                 if existing:
                     duplicate_rounds.append({
                         'date': round_data['date'],
@@ -993,6 +1045,45 @@ def import_launch_monitor_view(request):
         'device_choices': LaunchMonitorImport.DEVICE_CHOICES
     })
 
+# Common CSV club abbreviations and the bag club names each can match, in order of preference
+CLUB_ABBREVIATIONS = {
+    # Woods
+    'DRIVER': ['Driver'],
+    '3W': ['3 Wood', '3W'],
+    '5W': ['5 Wood', '5W'],
+    '7W': ['7 Wood', '7W'],
+
+    # Hybrids
+    '2H': ['2 Hybrid', '2H', '2 Iron'],
+    '3H': ['3 Hybrid', '3H', '3 Iron'],
+    '4H': ['4 Hybrid', '4H', '4 Iron'],
+    '5H': ['5 Hybrid', '5H', '5 Iron'],
+    '6H': ['6 Hybrid', '6H', '6 Iron'],
+    '7H': ['7 Hybrid', '7H', '7 Iron'],
+    '8H': ['8 Hybrid', '8H', '8 Iron'],
+    '9H': ['9 Hybrid', '9H', '9 Iron'],
+
+    # Irons
+    '2I': ['2 Iron', '2I'],
+    '3I': ['3 Iron', '3I'],
+    '4I': ['4 Iron', '4I'],
+    '5I': ['5 Iron', '5I'],
+    '6I': ['6 Iron', '6I'],
+    '7I': ['7 Iron', '7I'],
+    '8I': ['8 Iron', '8I'],
+    '9I': ['9 Iron', '9I'],
+
+    # Wedges
+    'PW': ['Pitching Wedge', 'PW'],
+    'GW': ['52 Degree', 'Gap Wedge', 'GW', '52°'],
+    'SW': ['56 Degree', 'Sand Wedge', 'SW', '56°'],
+    'LW': ['60 Degree', 'Lob Wedge', 'LW', '60°'],
+
+    # Alternative wedge names
+    'AW': ['52 Degree', 'Approach Wedge', 'AW', 'Gap Wedge'],
+    'UW': ['52 Degree', 'Utility Wedge', 'UW'],
+}
+
 def map_club_name(csv_club_name, user_clubs_dict):
     """
     Maps CSV club abbreviations to database club names.
@@ -1009,48 +1100,9 @@ def map_club_name(csv_club_name, user_clubs_dict):
         if club_name.upper() == csv_club:
             return club_obj
     
-    # Mapping dictionary for common abbreviations
-    club_mappings = {
-        # Woods
-        'DRIVER': ['Driver'],
-        '3W': ['3 Wood', '3W'],
-        '5W': ['5 Wood', '5W'],
-        '7W': ['7 Wood', '7W'],
-        
-        # Hybrids
-        '2H': ['2 Hybrid', '2H', '2 Iron'],
-        '3H': ['3 Hybrid', '3H', '3 Iron'],
-        '4H': ['4 Hybrid', '4H', '4 Iron'],
-        '5H': ['5 Hybrid', '5H', '5 Iron'],
-        '6H': ['6 Hybrid', '6H', '6 Iron'],
-        '7H': ['7 Hybrid', '7H', '7 Iron'],
-        '8H': ['8 Hybrid', '8H', '8 Iron'],
-        '9H': ['9 Hybrid', '9H', '9 Iron'],
-        
-        # Irons
-        '2I': ['2 Iron', '2I'],
-        '3I': ['3 Iron', '3I'],
-        '4I': ['4 Iron', '4I'],
-        '5I': ['5 Iron', '5I'],
-        '6I': ['6 Iron', '6I'],
-        '7I': ['7 Iron', '7I'],
-        '8I': ['8 Iron', '8I'],
-        '9I': ['9 Iron', '9I'],
-        
-        # Wedges
-        'PW': ['Pitching Wedge', 'PW'],
-        'GW': ['52 Degree', 'Gap Wedge', 'GW', '52°'],
-        'SW': ['56 Degree', 'Sand Wedge', 'SW', '56°'],
-        'LW': ['60 Degree', 'Lob Wedge', 'LW', '60°'],
-        
-        # Alternative wedge names
-        'AW': ['52 Degree', 'Approach Wedge', 'AW', 'Gap Wedge'],
-        'UW': ['52 Degree', 'Utility Wedge', 'UW'],
-    }
-    
     # Try mapping
-    if csv_club in club_mappings:
-        for possible_name in club_mappings[csv_club]:
+    if csv_club in CLUB_ABBREVIATIONS:
+        for possible_name in CLUB_ABBREVIATIONS[csv_club]:
             # Exact match
             if possible_name in user_clubs_dict:
                 return user_clubs_dict[possible_name]
@@ -1094,6 +1146,43 @@ def map_club_name(csv_club_name, user_clubs_dict):
     
     return None
 
+def find_existing_rounds(user, rounds):
+    """
+    Returns the user's saved rounds matching any of the parsed rounds, keyed by
+    (ISO date, course name), in one query. Where several match, the earliest saved is kept.
+    """
+    if not rounds:
+        return {}
+    dates = {round_data['date'] for round_data in rounds}
+    course_names = {round_data['courseName'] for round_data in rounds}
+    existing_rounds = {}
+    for golf_round in GolfRound.objects.filter(user=user, date__in=dates, course_name__in=course_names).order_by('pk'):
+        existing_rounds.setdefault((golf_round.date.isoformat(), golf_round.course_name), golf_round)
+    return existing_rounds
+
+def save_imported_shots(shots, errors):
+    """
+    Saves a round's imported shots (Shot field values) in batched INSERTs and returns how many
+    were saved. If the batch is rejected, the shots are saved one at a time so only the bad
+    ones are skipped, each reported in errors.
+    """
+    try:
+        with transaction.atomic():
+            Shot.objects.bulk_create([Shot(**fields) for fields in shots], batch_size=1000)
+        return len(shots)
+    except Exception:
+        pass
+    
+    saved = 0
+    for fields in shots:
+        try:
+            with transaction.atomic():
+                Shot.objects.create(**fields)
+            saved += 1
+        except Exception as e:
+            errors.append(f"Error creating shot: {str(e)}")
+    return saved
+
 @login_required
 def confirm_import_view(request, import_id):
     """Confirm and import the parsed launch monitor data."""
@@ -1117,15 +1206,16 @@ def confirm_import_view(request, import_id):
         
         # Get user's clubs for matching
         user_clubs = {club.name: club for club in Club.objects.filter(user=request.user)}
+        # Club matched to each CSV club name so far; an import repeats a handful of names
+        club_matches = {}
         
         try:
+            # Look up every round that may be a duplicate at once
+            existing_rounds = find_existing_rounds(request.user, parsed_data.get('rounds', []))
+            
             for round_data in parsed_data.get('rounds', []):
                 # Check for duplicate
-                existing_round = GolfRound.objects.filter(
-                    user=request.user,
-                    date=round_data['date'],
-                    course_name=round_data['courseName']
-                ).first()
+                existing_round = existing_rounds.get((round_data['date'], round_data['courseName']))
                 
                 if existing_round and not merge_duplicates:
                     errors.append(f"Skipped duplicate round: {round_data['courseName']} on {round_data['date']}")
@@ -1135,20 +1225,22 @@ def confirm_import_view(request, import_id):
                 if existing_round and merge_duplicates:
                     golf_round = existing_round
                 else:
-                    golf_round = GolfRound.objects.create(
+                    golf_round = GolfRound(
                         user=request.user,
                         date=round_data['date'],
                         course_name=round_data['courseName']
                     )
-                    rounds_created += 1
                 
-                # Import shots
+                # Import shots: collect the round's shots, then save them together with the round
+                round_shots = []
                 for hole_data in round_data.get('holes', []):
                     for shot_data in hole_data.get('shots', []):
                         club_name = shot_data.get('club', '').strip()
                         
-                        # Use the mapping function to find matching club
-                        club = map_club_name(club_name, user_clubs)
+                        # Use the mapping function to find matching club (once per distinct name)
+                        if club_name not in club_matches:
+                            club_matches[club_name] = map_club_name(club_name, user_clubs)
+                        club = club_matches[club_name]
                         
                         if not club:
                             errors.append(f"Club '{club_name}' not found in your bag. Shot skipped.")
@@ -1163,22 +1255,25 @@ def confirm_import_view(request, import_id):
                         shot_shape = shot_data.get('shotShape', 'Straight')
                         
                         # Validate shot_shape is one of the allowed choices
-                        valid_shapes = ['Straight', 'Fade', 'Draw', 'Slice', 'Hook']
-                        if shot_shape not in valid_shapes:
+                        if shot_shape not in VALID_SHOT_SHAPES:
                             shot_shape = 'Straight'
                         
-                        # Create shot
-                        try:
-                            Shot.objects.create(
-                                golf_round=golf_round,
-                                club=club,
-                                distance=shot_data.get('distance', 0),
-                                shot_shape=shot_shape,
-                                lie=lie
-                            )
-                            shots_created += 1
-                        except Exception as e:
-                            errors.append(f"Error creating shot: {str(e)}")
+                        round_shots.append({
+                            'golf_round': golf_round,
+                            'club': club,
+                            'distance': shot_data.get('distance', 0),
+                            'shot_shape': shot_shape,
+                            'lie': lie
+                        })
+                
+                # Create the round (if new) and its shots together, so a failure leaves neither behind
+                with transaction.atomic():
+                    if golf_round.pk is None:
+                        golf_round.save()
+                        rounds_created += 1
+                        # Later rounds in this import can duplicate the one just saved
+                        existing_rounds.setdefault((golf_round.date.isoformat(), golf_round.course_name), golf_round)
+                    shots_created += save_imported_shots(round_shots, errors)
             
             # Update import record
             import_record.status = 'imported' if not errors else 'partial'
@@ -1213,13 +1308,11 @@ def confirm_import_view(request, import_id):
     
     # GET request - show confirmation page
     parsed_data = import_record.parsed_data
+    rounds = parsed_data.get('rounds', []) if parsed_data else []
+    existing_rounds = find_existing_rounds(request.user, rounds)
     duplicate_rounds = []
-    for round_data in parsed_data.get('rounds', []) if parsed_data else []:
-        existing = GolfRound.objects.filter(
-            user=request.user,
-            date=round_data['date'],
-            course_name=round_data['courseName']
-        ).first()
+    for round_data in rounds:
+        existing = existing_rounds.get((round_data['date'], round_data['courseName']))
         if existing:
             duplicate_rounds.append({
                 'date': round_data['date'],